@@ -2,23 +2,46 @@
 import os
 from dotenv import load_dotenv
 load_dotenv()
-from crewai import Agent
+from crewai import Agent, LLM
 
 # FIXED: Import the corrected tools
 from tools import search_tool, read_blood_test_report
 
 ### Loading LLM
-# Initialize LLM with proper configuration
-from langchain_openai import ChatOpenAI
+# Model tiers: the doctor gets the stronger model for clinical interpretation and the
+# integrated summary; checklist-style and planning tasks run on a smaller, cheaper model.
+# Override either tier with VWO_DOCTOR_MODEL / VWO_LIGHT_MODEL.
 
 # Validate environment variables
 if not os.getenv("OPENAI_API_KEY"):
     raise ValueError("OPENAI_API_KEY not found in environment variables. Please set it in your .env file.")
 
-llm = ChatOpenAI(
-    model="gpt-3.5-turbo",
+DOCTOR_MODEL = os.getenv("VWO_DOCTOR_MODEL", "gpt-4o")
+LIGHT_MODEL = os.getenv("VWO_LIGHT_MODEL", "gpt-4o-mini")
+
+# Verification output is a structured pass/fail checklist - the small model is sufficient
+verifier_llm = LLM(
+    model=LIGHT_MODEL,
+    temperature=0.1,
+    api_key=os.getenv("OPENAI_API_KEY"),
+    max_tokens=1500
+)
+
+# Nutrition and exercise plans are long but template-shaped - small model, more output room
+planner_llm = LLM(
+    model=LIGHT_MODEL,
+    temperature=0.1,
+    api_key=os.getenv("OPENAI_API_KEY"),
+    max_tokens=3000
+)
+
+# Streaming LLM for the doctor agent so the long integrated health summary can be
+# rendered token-by-token instead of after the full completion returns
+doctor_llm = LLM(
+    model=DOCTOR_MODEL,
     temperature=0.1,
-    openai_api_key=os.getenv("OPENAI_API_KEY")
+    api_key=os.getenv("OPENAI_API_KEY"),
+    stream=True
 )
 
 # FIXED: Creating an Experienced Doctor agent with correct tool reference
@@ -37,7 +60,7 @@ doctor = Agent(
         "You emphasize that your analysis is for informational purposes and recommend consulting healthcare providers for medical decisions."
     ),
     tools=[read_blood_test_report, search_tool],  # FIXED: Use the correct tool functions
-    llm=llm,
+    llm=doctor_llm,
     max_iter=3,
     max_rpm=10,
     allow_delegation=False
@@ -57,14 +80,13 @@ verifier = Agent(
         "You flag any inconsistencies or potential data quality issues that could affect analysis accuracy."
     ),
     tools=[read_blood_test_report],  # FIXED: Use the correct tool function
-    llm=llm,
+    llm=verifier_llm,
     max_iter=2,
     max_rpm=10,
     allow_delegation=False
 )
 
-# OPTIONAL: Additional agents (currently unused in task.py but kept for future use)
-# You can remove these if you want to clean up unused code
+# Specialist agents for the nutrition and exercise tasks (mid-tier model)
 
 nutritionist = Agent(
     role="Clinical Nutritionist",
@@ -80,7 +102,7 @@ nutritionist = Agent(
         "You work collaboratively with healthcare teams to support optimal patient outcomes through nutrition."
     ),
     tools=[read_blood_test_report],  # FIXED: Use the correct tool function
-    llm=llm,
+    llm=planner_llm,
     max_iter=2,
     max_rpm=10,
     allow_delegation=False
@@ -100,7 +122,7 @@ exercise_specialist = Agent(
         "You believe in gradual progression and sustainable lifestyle changes rather than extreme interventions."
     ),
     tools=[read_blood_test_report],  # FIXED: Use the correct tool function
-    llm=llm,
+    llm=planner_llm,
     max_iter=2,
     max_rpm=10,
     allow_delegation=False
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 import os
+import io
 import sys
+import json
 import time
 import argparse
+import contextlib
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any
@@ -26,6 +29,7 @@ Examples:
   python main.py -f data/my_test.pdf               # Specify file
   python main.py -f data/sample.txt -q "Check glucose"  # File + query
   python main.py --save                            # Save results to file
+  python main.py --no-cache                        # Ignore cached task outputs
         
 For support, ensure .env file contains your OpenAI API key.
         """
@@ -55,6 +59,12 @@ For support, ensure .env file contains your OpenAI API key.
         version=f'{APP_NAME} {APP_VERSION}'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Run every task fresh: do not reuse or store cached task outputs (same as BLOOD_TEST_NO_CACHE=1)'
+    )
+    
     parser.add_argument(
         '--test-system',
         action='store_true',
@@ -79,8 +89,70 @@ For support, ensure .env file contains your OpenAI API key.
         help='Validate a specific query (for testing)'
     )
     
+    parser.add_argument(
+        '--dry-run-validate',
+        action='store_true',
+        help='Only validate --file and --query, then exit without loading the AI system (for testing)'
+    )
+    
+    parser.add_argument(
+        '--batch-queries',
+        type=str,
+        help='Run every {"q": ..., "disc": ...} line of a JSONL file against --file in one process (for automated testing)'
+    )
+    
+    parser.add_argument(
+        '--test-stdin-protocol',
+        action='store_true',
+        help='Serve JSON-lines CLI runs from stdin in one process (for automated testing)'
+    )
+    
     return parser
 
+# Input validation - dependency-free so --dry-run-validate can run before the heavy imports
+def validate_file_path(file_path: str):
+    """Validate a blood test file path; returns (path, size in MB) or raises"""
+    path_obj = Path(file_path)
+    
+    if not path_obj.exists():
+        raise FileNotFoundError(f"File not found: {file_path}")
+    
+    if path_obj.suffix.lower() not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported file format. Supported: {SUPPORTED_FORMATS}")
+    
+    file_size_mb = path_obj.stat().st_size / (1024 * 1024)
+    if file_size_mb > MAX_FILE_SIZE_MB:
+        raise ValueError(f"File too large ({file_size_mb:.1f}MB). Maximum: {MAX_FILE_SIZE_MB}MB")
+    
+    return path_obj, file_size_mb
+
+def validate_query_text(query: str):
+    """Validate an analysis query; raises ValueError when it cannot be used"""
+    if len(query) < 5:  # Reduced from 10 to 5 for testing
+        raise ValueError("Query must be at least 5 characters long")
+    
+    if len(query) > 2000:
+        raise ValueError("Query must not exceed 2000 characters")
+    
+    # Check for harmful content
+    harmful_keywords = ['suicide', 'kill', 'harm', 'poison']
+    if any(keyword in query.lower() for keyword in harmful_keywords):
+        raise ValueError("Query contains harmful content. Please contact emergency services if needed.")
+
+def run_validation_only(args):
+    """--dry-run-validate: check the file and query arguments, then exit"""
+    try:
+        if args.file:
+            path_obj, file_size_mb = validate_file_path(args.file)
+            print(f"✅ File validated: {path_obj.name} ({file_size_mb:.2f}MB)")
+        if args.query is not None:
+            validate_query_text(args.query)
+            print(f"✅ Query validated: {len(args.query)} characters")
+    except (OSError, ValueError) as e:
+        print(f"❌ Validation failed: {e}")
+        sys.exit(1)
+    sys.exit(0)
+
 # Parse arguments early so --help and --version work even if imports fail
 def early_argument_check():
     """Handle version and help before any imports that might fail"""
@@ -98,6 +170,10 @@ def early_argument_check():
         parser.print_help()
         sys.exit(0)
     
+    # Validation-only runs never need CrewAI, agents or tools
+    if '--dry-run-validate' in sys.argv:
+        run_validation_only(setup_argument_parser().parse_args())
+    
     return None
 
 # Call early argument check before any problematic imports
@@ -124,7 +200,7 @@ except ImportError as e:
 
 # Agent imports
 try:
-    from agents import doctor, verifier
+    from agents import doctor, verifier, nutritionist, exercise_specialist
     AGENTS_AVAILABLE = True
 except ImportError as e:
     AGENTS_AVAILABLE = False
@@ -132,22 +208,43 @@ except ImportError as e:
     # Create mock agents for testing
     doctor = None
     verifier = None
+    nutritionist = None
+    exercise_specialist = None
 
 # Task imports
 try:
-    from task import TASK_SEQUENCE, validate_task_dependencies
+    from task import TASK_SEQUENCE, validate_task_dependencies, integrated_health_summary, WorkflowAbort
     TASKS_AVAILABLE = True
 except ImportError as e:
     TASKS_AVAILABLE = False
     IMPORT_ERRORS.append(f"Tasks not available: {e}")
     # Create mock task sequence
     TASK_SEQUENCE = []
+    integrated_health_summary = None
     def validate_task_dependencies():
         pass
+    class WorkflowAbort(Exception):
+        pass
+
+# Event bus imports (used to stream the integrated summary while it is generated)
+try:
+    from crewai.utilities.events import (
+        crewai_event_bus, LLMStreamChunkEvent, TaskStartedEvent, TaskCompletedEvent
+    )
+    STREAMING_AVAILABLE = True
+except ImportError:
+    STREAMING_AVAILABLE = False
+
+# Run cache imports (reuses task outputs across sessions for the same report)
+try:
+    from run_cache import TaskOutputCache, hash_report, cache_enabled
+    RUN_CACHE_AVAILABLE = True
+except ImportError:
+    RUN_CACHE_AVAILABLE = False
 
 # Tool imports
 try:
-    from tools import read_blood_test_report, search_tool
+    from tools import read_blood_test_report, search_tool, prefetch_blood_test_report, discard_prefetched_report
     TOOLS_AVAILABLE = True
 except ImportError as e:
     TOOLS_AVAILABLE = False
@@ -156,6 +253,10 @@ except ImportError as e:
     def read_blood_test_report(path):
         return f"Mock tool: Cannot read {path} - tools not available"
     search_tool = None
+    def prefetch_blood_test_report(path):
+        pass
+    def discard_prefetched_report(path):
+        pass
 
 # ✅ Medical Safety Protocols
 MEDICAL_DISCLAIMER = """
@@ -187,10 +288,77 @@ EMERGENCY_GUIDANCE = """
 • Mental Health Crisis: National crisis hotlines or local mental health services
 """
 
+class SummaryStreamer:
+    """Echo the integrated health summary to the terminal as its tokens arrive"""
+
+    def __init__(self):
+        self.active = False
+        self.chunks = []
+
+    def register(self):
+        """Attach the streaming handlers to the CrewAI event bus"""
+        crewai_event_bus.register_handler(TaskStartedEvent, self._on_task_started)
+        crewai_event_bus.register_handler(TaskCompletedEvent, self._on_task_completed)
+        crewai_event_bus.register_handler(LLMStreamChunkEvent, self._on_chunk)
+
+    def reset(self):
+        """Forget chunks collected during a previous analysis"""
+        self.active = False
+        self.chunks = []
+
+    @property
+    def text(self) -> str:
+        """Full summary assembled from the streamed chunks"""
+        return "".join(self.chunks)
+
+    def already_shown(self, result: str) -> bool:
+        """True when result was printed while streaming (the stream also carries the agent's reasoning)"""
+        body = result.strip()
+        return bool(body) and body in self.text
+
+    def _on_task_started(self, source, event):
+        self.active = integrated_health_summary is not None and event.task is integrated_health_summary
+        if self.active:
+            print("\n📡 Streaming integrated health summary...\n")
+
+    def _on_task_completed(self, source, event):
+        if self.active:
+            print()
+        self.active = False
+
+    def _on_chunk(self, source, event):
+        if self.active and event.chunk:
+            self.chunks.append(event.chunk)
+            sys.stdout.write(event.chunk)
+            sys.stdout.flush()
+
+SUMMARY_STREAMER = SummaryStreamer()
+if STREAMING_AVAILABLE:
+    SUMMARY_STREAMER.register()
+
+class TaskOutputRecorder:
+    """Persist each task output to the run cache as soon as the task completes"""
+
+    def __init__(self):
+        self.cache = None
+
+    def register(self):
+        """Attach the recorder to the CrewAI event bus"""
+        crewai_event_bus.register_handler(TaskCompletedEvent, self._on_task_completed)
+
+    def _on_task_completed(self, source, event):
+        if self.cache is not None and event.task is not None and event.task.name:
+            self.cache.save(event.task, event.output)
+
+TASK_OUTPUT_RECORDER = TaskOutputRecorder()
+if STREAMING_AVAILABLE and RUN_CACHE_AVAILABLE:
+    TASK_OUTPUT_RECORDER.register()
+
 class BloodTestAnalyzer:
     """Professional blood test analysis system with multi-agent AI workflow"""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
+        self.use_cache = use_cache  # Reuse/store task outputs in the run cache
         self.session_id = f"session_{int(time.time())}"
         self.start_time = datetime.now()
     
@@ -308,12 +476,11 @@ class BloodTestAnalyzer:
             except Exception as e:
                 errors.append(f"Tool validation failed: {str(e)}")
         
-        # Create required directories
+        # Create required directories (test suites create them once and set VWO_SKIP_DIR_INIT)
         try:
-            data_dir = Path("data")
-            logs_dir = Path("logs")
-            data_dir.mkdir(exist_ok=True)
-            logs_dir.mkdir(exist_ok=True)
+            if os.getenv("VWO_SKIP_DIR_INIT") != "1":
+                Path("data").mkdir(exist_ok=True)
+                Path("logs").mkdir(exist_ok=True)
             print("  ✅ Required directories initialized")
         except Exception as e:
             errors.append(f"Directory creation failed: {str(e)}")
@@ -374,17 +541,7 @@ class BloodTestAnalyzer:
                 file_path = "data/sample.txt"
         
         # Validate file
-        path_obj = Path(file_path)
-        
-        if not path_obj.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
-        if path_obj.suffix.lower() not in SUPPORTED_FORMATS:
-            raise ValueError(f"Unsupported file format. Supported: {SUPPORTED_FORMATS}")
-        
-        file_size_mb = path_obj.stat().st_size / (1024 * 1024)
-        if file_size_mb > MAX_FILE_SIZE_MB:
-            raise ValueError(f"File too large ({file_size_mb:.1f}MB). Maximum: {MAX_FILE_SIZE_MB}MB")
+        path_obj, file_size_mb = validate_file_path(file_path)
         
         print(f"✅ File validated: {path_obj.name} ({file_size_mb:.2f}MB)")
         return str(path_obj)
@@ -410,16 +567,7 @@ class BloodTestAnalyzer:
                 query = "Please provide a comprehensive analysis of my blood test results with health recommendations"
         
         # Validate query
-        if len(query) < 5:  # Reduced from 10 to 5 for testing
-            raise ValueError("Query must be at least 5 characters long")
-        
-        if len(query) > 2000:
-            raise ValueError("Query must not exceed 2000 characters")
-        
-        # Check for harmful content
-        harmful_keywords = ['suicide', 'kill', 'harm', 'poison']
-        if any(keyword in query.lower() for keyword in harmful_keywords):
-            raise ValueError("Query contains harmful content. Please contact emergency services if needed.")
+        validate_query_text(query)
         
         print(f"✅ Query validated: {len(query)} characters")
         return query
@@ -430,7 +578,7 @@ class BloodTestAnalyzer:
         print("-" * 40)
         print(f"📄 File: {Path(file_path).name}")
         print(f"📝 Query: {query[:80]}{'...' if len(query) > 80 else ''}")
-        print(f"🤖 Agents: Doctor + Verifier (Multi-agent workflow)")
+        print(f"🤖 Agents: Doctor + Verifier + Nutrition / Exercise specialists (Multi-agent workflow)")
         print(f"📋 Tasks: {len(TASK_SEQUENCE)} sequential tasks with dependencies")
         
         print(f"\n⏳ Processing analysis... This may take 1-3 minutes")
@@ -449,27 +597,55 @@ class BloodTestAnalyzer:
             # ✅ Complete multi-agent workflow execution
             analysis_start = time.time()
             
-            medical_crew = Crew(
-                agents=[doctor, verifier],  # Both agents
-                tasks=TASK_SEQUENCE,        # Complete 5-task workflow
-                process=Process.sequential,
-            )
-            
-            # Execute analysis with proper parameters
-            result = medical_crew.kickoff({
-                'query': query,
-                'report_path': file_path
-            })
+            # Warm start: reuse outputs cached for this exact report, query and upstream results
+            pending_tasks = TASK_SEQUENCE
+            run_cache = None
+            if self.use_cache and RUN_CACHE_AVAILABLE and STREAMING_AVAILABLE and cache_enabled():
+                run_cache = TaskOutputCache(hash_report(file_path), query)
+                pending_tasks = run_cache.restore(TASK_SEQUENCE)
+                cached_count = len(TASK_SEQUENCE) - len(pending_tasks)
+                if cached_count:
+                    print(f"\n♻️  Reusing {cached_count} cached task output(s) for this report")
             
+            result = None
+            SUMMARY_STREAMER.reset()  # Nothing from an earlier analysis counts as already shown
+            if pending_tasks:
+                medical_crew = Crew(
+                    agents=[doctor, verifier, nutritionist, exercise_specialist],  # Tiered agents
+                    tasks=pending_tasks,        # 5-task workflow minus cached steps
+                    process=Process.sequential,
+                )
+                
+                # Execute analysis with proper parameters (summary tokens stream as they arrive)
+                TASK_OUTPUT_RECORDER.cache = run_cache
+                # Parse the report in the background while the crew spins up the first LLM call
+                prefetch_blood_test_report(file_path)
+                try:
+                    result = medical_crew.kickoff({
+                        'query': query,
+                        'report_path': file_path
+                    })
+                finally:
+                    TASK_OUTPUT_RECORDER.cache = None
+                    discard_prefetched_report(file_path)  # Release a read no task consumed
+
             analysis_time = time.time() - analysis_start
             
             print(f"\n✅ Analysis completed successfully!")
             print(f"⏱️  Processing time: {analysis_time:.1f} seconds")
-            print(f"📊 Tasks executed: {len(TASK_SEQUENCE)}")
-            print(f"🤖 Agents used: Doctor, Verifier")
-            
-            return str(result)
-            
+            print(f"📊 Tasks executed: {len(pending_tasks)} (cached: {len(TASK_SEQUENCE) - len(pending_tasks)})")
+            print(f"🤖 Agents used: Doctor, Verifier, Nutritionist, Exercise Specialist")
+
+            if result is None:
+                return str(TASK_SEQUENCE[-1].output.raw)
+            return str(result) or SUMMARY_STREAMER.text
+
+        except WorkflowAbort as abort:
+            # Verification rejected the document - downstream tasks were skipped on purpose
+            print(f"\n🛑 Workflow stopped early: {abort}")
+            print(f"⏭️  Skipped medical, nutrition, exercise and summary tasks")
+            return str(abort.output.raw)
+
         except Exception as e:
             error_details = str(e)
             print(f"\n❌ Analysis failed: {error_details}")
@@ -581,7 +757,10 @@ Always consult qualified healthcare professionals for medical advice.
         # Main analysis results
         print("\n🔬 ANALYSIS RESULTS:")
         print("=" * 70)
-        print(analysis_result)
+        if SUMMARY_STREAMER.already_shown(analysis_result):
+            print("(Integrated health summary streamed above)")
+        else:
+            print(analysis_result)
         print("=" * 70)
         
         # Medical safety reminder
@@ -675,7 +854,8 @@ Physician: Dr. VWO Sample
 """
     
     data_dir = Path("data")
-    data_dir.mkdir(exist_ok=True)
+    if os.getenv("VWO_SKIP_DIR_INIT") != "1":
+        data_dir.mkdir(exist_ok=True)
     sample_file = data_dir / "sample.txt"
     
     if not sample_file.exists():
@@ -683,10 +863,73 @@ Physician: Dr. VWO Sample
         return True
     return False
 
-def main():
+# Marks protocol responses so they can be told apart from stray library output on stdout
+TEST_PROTOCOL_PREFIX = "@@vwo-test "
+
+def run_protocol_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Run main() in-process for one protocol request, capturing what a subprocess would print"""
+    stdout_buffer = io.StringIO()
+    stderr_buffer = io.StringIO()
+    real_stdin = sys.stdin
+    sys.stdin = io.StringIO(request.get("stdin") or "")
+    returncode = 0
+    try:
+        with contextlib.redirect_stdout(stdout_buffer), contextlib.redirect_stderr(stderr_buffer):
+            main(request.get("args", []))
+    except SystemExit as exit_request:
+        code = exit_request.code
+        returncode = code if isinstance(code, int) else (0 if code is None else 1)
+    except Exception as e:
+        stderr_buffer.write(f"{type(e).__name__}: {e}\n")
+        returncode = 1
+    finally:
+        sys.stdin = real_stdin
+    
+    return {"rc": returncode, "stdout": stdout_buffer.getvalue(), "stderr": stderr_buffer.getvalue()}
+
+def write_protocol_response(response: Dict[str, Any]):
+    """Emit one prefixed JSON response line"""
+    # CrewAI wraps sys.stdout in a filter that drops any line mentioning litellm - bypass it
+    sys.__stdout__.write(TEST_PROTOCOL_PREFIX + json.dumps(response) + "\n")
+    sys.__stdout__.flush()
+
+def run_test_stdin_protocol():
+    """
+    Persistent test mode: read one JSON request per line ({"args": [...], "stdin": "yes\\n"})
+    and answer each with one prefixed JSON line, so the test suite pays startup cost once
+    """
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        write_protocol_response(run_protocol_request(json.loads(line)))
+
+def run_batch_queries(batch_path: str, file_path: Optional[str]):
+    """Answer each (query, disclaimer answer) record of a JSONL file with one protocol response"""
+    with open(batch_path, 'r', encoding='utf-8') as batch_file:
+        records = [json.loads(line) for line in batch_file if line.strip()]
+    
+    file_args = ['-f', file_path] if file_path else []
+    for record in records:
+        write_protocol_response(run_protocol_request({
+            "args": [*file_args, '-q', record["q"]],
+            "stdin": record.get("disc", "yes") + "\n",
+        }))
+
+def main(argv=None):
     """Main application entry point"""
     parser = setup_argument_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    
+    if args.test_stdin_protocol:
+        run_test_stdin_protocol()
+        return
+    
+    if args.batch_queries:
+        run_batch_queries(args.batch_queries, args.file)
+        return
+    
+    if args.dry_run_validate:
+        run_validation_only(args)
     
     try:
         # Handle special commands first
@@ -697,7 +940,7 @@ def main():
             sys.exit(0 if is_ready else 1)
         
         # Initialize analyzer
-        analyzer = BloodTestAnalyzer()
+        analyzer = BloodTestAnalyzer(use_cache=not args.no_cache)
         
         # Display header
         analyzer.print_header()
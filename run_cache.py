@@ -0,0 +1,130 @@
+"""
+Persistent Task Output Cache for Blood Test Analysis System
+Completed task outputs survive process exit so a repeat query on the same report can skip the LLM calls
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+# Zstandard keeps the multi-KB medical reports small on disk; plain JSON is used without it
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+CACHE_ROOT = Path(os.getenv("BLOOD_TEST_CACHE_DIR", Path.home() / ".cache" / "blood_test")) / "runs"
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+CACHE_SUFFIX = ".json.zst" if ZSTD_AVAILABLE else ".json"
+
+def cache_enabled() -> bool:
+    """The cache is on unless BLOOD_TEST_NO_CACHE=1 (or main.py --no-cache) opts out"""
+    return os.getenv("BLOOD_TEST_NO_CACHE") != "1"
+
+def hash_report(file_path: str) -> str:
+    """Content hash of the uploaded report - the same bytes always map to the same cache directory"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _task_dependencies(task):
+    # CrewAI uses a NOT_SPECIFIED sentinel when a task declares no context
+    return task.context if isinstance(task.context, list) else ()
+
+class TaskOutputCache:
+    """
+    Task outputs for one report, stored under ``runs/<report_hash>/``.
+
+    Each entry is content-addressed by the report hash, task name, user query, the task's
+    prompt (description and expected output before input interpolation), the agent's model
+    and the raw outputs of the task's upstream context, so an output is only reused when
+    everything it was derived from is unchanged.
+    """
+
+    def __init__(self, report_hash: str, query: str, root: Path = CACHE_ROOT):
+        self.report_hash = report_hash
+        self.query = query
+        self.report_dir = Path(root) / report_hash
+
+    def _entry_path(self, task) -> Path:
+        digest = hashlib.blake2b(digest_size=16)
+        # CrewAI rewrites description/expected_output in place at kickoff; hash the templates
+        description = getattr(task, "_original_description", None) or task.description
+        expected_output = getattr(task, "_original_expected_output", None) or task.expected_output
+        llm = getattr(task.agent, "llm", None)
+        model = str(getattr(llm, "model", None) or llm or "")
+        for part in (self.report_hash, task.name or "", self.query, description, expected_output, model):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        for dep_task in _task_dependencies(task):
+            digest.update(dep_task.output.raw.encode("utf-8"))
+            digest.update(b"\0")
+        return self.report_dir / f"{task.name}-{digest.hexdigest()}{CACHE_SUFFIX}"
+
+    def load(self, task) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for ``task`` or None when missing or expired"""
+        path = self._entry_path(task)
+        try:
+            if time.time() - path.stat().st_mtime > CACHE_TTL_SECONDS:
+                return None
+            data = path.read_bytes()
+            if ZSTD_AVAILABLE:
+                data = zstandard.ZstdDecompressor().decompress(data)
+            return json.loads(data)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, task, output) -> None:
+        """Write a completed task output; cache failures never interrupt an analysis"""
+        payload = json.dumps({
+            "raw": output.raw,
+            "summary": output.summary,
+            "json_dict": output.json_dict,
+        }).encode("utf-8")
+        if ZSTD_AVAILABLE:
+            payload = zstandard.ZstdCompressor().compress(payload)
+
+        path = self._entry_path(task)
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            self.report_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️  Could not cache {task.name} output: {e}")
+
+    def restore(self, tasks) -> list:
+        """
+        Attach cached outputs to ``tasks`` and return the tasks that still have to run.
+        A task is only restored when all of its context tasks were restored as well.
+        """
+        from crewai.tasks.task_output import TaskOutput
+
+        restored = set()
+        pending = []
+        for task in tasks:
+            payload = None
+            if all(id(dep_task) in restored for dep_task in _task_dependencies(task)):
+                payload = self.load(task)
+
+            if payload is None:
+                pending.append(task)
+                continue
+
+            task.output = TaskOutput(
+                description=task.description,
+                name=task.name,
+                expected_output=task.expected_output,
+                raw=payload.get("raw", ""),
+                summary=payload.get("summary"),
+                json_dict=payload.get("json_dict"),
+                agent=task.agent.role if task.agent else "",
+            )
+            restored.add(id(task))
+        return pending
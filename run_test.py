@@ -57,7 +57,7 @@ class MasterTestRunner:
         print(f"✅ All prerequisites satisfied")
         return True
     
-    def run_test_suite(self, script_name: str, description: str, timeout: int = 60):
+    def run_test_suite(self, script_name: str, description: str, timeout: int = 60, script_args=()):
         """Run a specific test suite"""
         print(f"\n{'='*20} {description} {'='*20}")
         print(f"📄 Script: {script_name}")
@@ -72,7 +72,7 @@ class MasterTestRunner:
         try:
             # Run the test script
             result = subprocess.run(
-                [sys.executable, script_name],
+                [sys.executable, script_name, *script_args],
                 capture_output=True,
                 text=True,
                 timeout=timeout
@@ -187,10 +187,11 @@ class MasterTestRunner:
         ]
         
         if not skip_integration:
-            test_order.append(('test_integration.py', 'End-to-End Integration', 300))
+            # Already confirmed above - the child has no terminal to prompt on
+            test_order.append(('test_integration.py', 'End-to-End Integration', 300, ['--yes']))
         
-        for script, description, timeout in test_order:
-            self.run_test_suite(script, description, timeout)
+        for script, description, timeout, *script_args in test_order:
+            self.run_test_suite(script, description, timeout, *script_args)
         
         # Print comprehensive summary
         self.print_comprehensive_summary()
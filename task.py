@@ -1,8 +1,91 @@
+import logging
+import re
+import sys
+import textwrap
+from typing import Optional, Tuple
+
 from crewai import Task
-from agents import doctor, verifier
+from pydantic import PrivateAttr, model_validator
+
+from agents import doctor, verifier, nutritionist, exercise_specialist
 # FIXED: Import the corrected tools
 from tools import search_tool, read_blood_test_report
 
+logger = logging.getLogger(__name__)
+
+QUERY_PLACEHOLDER = "{query}"
+
+def _prompt(text: str) -> str:
+    """Dedent a task prompt and intern it so every crew shares one copy of the string"""
+    return sys.intern(textwrap.dedent(text).strip())
+
+class WorkflowTask(Task):
+    """
+    Task that renders its ``{query}`` placeholder by plain concatenation.
+
+    The description is split around the placeholder once at construction time, so each
+    kickoff costs ``prefix + query + suffix`` instead of a template scan over the whole
+    multi-kilobyte prompt. Tasks without any placeholder skip interpolation entirely.
+    """
+
+    _query_template: Optional[Tuple[str, str]] = PrivateAttr(default=None)
+    _is_static: bool = PrivateAttr(default=False)
+    _title: str = PrivateAttr(default="")
+
+    @model_validator(mode="after")
+    def _precompile_query_template(self):
+        # Short label for logs - split stops at the first period instead of every one
+        self._title = self.description.split('.', 1)[0].strip()[:50]
+        if "{" not in self.expected_output and "}" not in self.expected_output:
+            prefix, placeholder, suffix = self.description.partition(QUERY_PLACEHOLDER)
+            static_text = prefix + suffix
+            # Only take the fast path when {query} is the sole placeholder in the prompt
+            if "{" not in static_text and "}" not in static_text:
+                if placeholder:
+                    self._query_template = (prefix, suffix)
+                else:
+                    self._is_static = True
+        return self
+
+    def interpolate_inputs_and_add_conversation_history(self, inputs):
+        has_fast_path = self._query_template is not None or self._is_static
+        if not has_fast_path or not inputs or inputs.get("crew_chat_messages") or (
+            self._query_template is not None and "query" not in inputs
+        ):
+            return super().interpolate_inputs_and_add_conversation_history(inputs)
+
+        if self._original_description is None:
+            self._original_description = self.description
+        if self._original_expected_output is None:
+            self._original_expected_output = self.expected_output
+
+        if self._query_template is not None:
+            prefix, suffix = self._query_template
+            self.description = prefix + str(inputs["query"]) + suffix
+
+class WorkflowAbort(Exception):
+    """Raised when verification rejects the document, cutting off all downstream tasks"""
+
+    def __init__(self, message: str, output):
+        super().__init__(message)
+        self.output = output
+
+# Verdict lines from the verification expected_output that mean "do not analyze"
+REJECTION_PATTERN = re.compile(
+    r"BLOOD TEST REPORT:[\s*\[]*NO\b"
+    r"|suitable for medical analysis:[\s*\[]*NO\b"
+    r"|quality rating:[\s*\[]*Invalid\b",
+    re.IGNORECASE
+)
+
+def verification_gate(output):
+    """
+    Verification task callback - stop the workflow early for non blood test documents
+    """
+    verdict = REJECTION_PATTERN.search(output.raw or "")
+    if verdict:
+        raise WorkflowAbort(f"Document rejected during verification ({verdict.group(0).strip()})", output)
+
 # Task Definitions for Blood Test Analysis - ALL BUGS FIXED INCLUDING COMPATIBILITY
 
 ## BUG #5 FIX: Proper Task Dependencies and Workflow
@@ -10,8 +93,9 @@ from tools import search_tool, read_blood_test_report
 # AFTER: Logical workflow where each task builds on previous analyses
 
 ## STEP 1: Document Verification (First - No dependencies)
-verification = Task(
-    description="""
+verification = WorkflowTask(
+    name="verification",
+    description=_prompt("""
     Thoroughly verify and validate the authenticity, completeness, and quality of the provided medical document.
     
     Document Verification Protocol:
@@ -54,8 +138,8 @@ verification = Task(
     - Reference ranges must be provided for accurate interpretation
     - Document quality must be sufficient for reliable medical analysis
     - Any concerns about authenticity must be clearly flagged
-    """,
-    expected_output="""
+    """),
+    expected_output=_prompt("""
     Comprehensive document verification report including:
     
     1. DOCUMENT AUTHENTICATION:
@@ -99,16 +183,18 @@ verification = Task(
        - Quality improvement suggestions: [How to obtain better documentation]
     
     Format: Structured verification checklist with clear pass/fail status and actionable recommendations
-    """,
+    """),
     agent=verifier,
     tools=[read_blood_test_report],  # FIXED: Use correct tool function
     async_execution=False,
+    callback=verification_gate,  # Early exit: skip downstream tasks for rejected documents
     # NO CONTEXT - This is the first task in the workflow
 )
 
 ## STEP 2: Medical Analysis (Depends on verification)
-help_patients = Task(
-    description="""
+help_patients = WorkflowTask(
+    name="help_patients",
+    description=_prompt("""
     Analyze the provided blood test report with medical precision and professionalism.
     
     User Query: {query}
@@ -131,8 +217,8 @@ help_patients = Task(
     - Always include appropriate medical disclaimers
     - Emphasize the importance of professional medical consultation
     - Note any analysis limitations identified during verification
-    """,
-    expected_output="""
+    """),
+    expected_output=_prompt("""
     A comprehensive medical analysis report including:
     
     1. BLOOD TEST SUMMARY:
@@ -165,7 +251,7 @@ help_patients = Task(
        - Analysis limitations based on verification findings
     
     Format: Professional medical report with proper medical terminology and citations
-    """,
+    """),
     agent=doctor,
     tools=[read_blood_test_report, search_tool],  # FIXED: Use correct tool functions
     async_execution=False,
@@ -173,8 +259,9 @@ help_patients = Task(
 )
 
 ## STEP 3: Nutrition Analysis (Depends on verification and medical analysis)
-nutrition_analysis = Task(
-    description="""
+nutrition_analysis = WorkflowTask(
+    name="nutrition_analysis",
+    description=_prompt("""
     Provide evidence-based nutritional guidance based on blood test results and current nutritional science.
     
     User Query: {query}
@@ -204,8 +291,8 @@ nutrition_analysis = Task(
     - Cite peer-reviewed nutritional studies
     - Use recommendations from registered dietitians and nutrition organizations
     - Ensure recommendations align with medical analysis findings
-    """,
-    expected_output="""
+    """),
+    expected_output=_prompt("""
     Professional nutritional assessment including:
     
     1. NUTRITIONAL STATUS ANALYSIS:
@@ -244,16 +331,17 @@ nutrition_analysis = Task(
        - Professional nutrition organization recommendations
     
     Format: Structured nutritional plan with scientific backing and practical implementation guidance
-    """,
-    agent=doctor,
+    """),
+    agent=nutritionist,  # Mid-tier model for structured nutrition plans
     tools=[read_blood_test_report, search_tool],  # FIXED: Use correct tool functions
     async_execution=False,
     context=[verification, help_patients],  # BUG #5 FIX: Depends on verification AND medical analysis
 )
 
 ## STEP 4: Exercise Planning (Depends on verification, medical analysis, and nutrition analysis)
-exercise_planning = Task(
-    description="""
+exercise_planning = WorkflowTask(
+    name="exercise_planning",
+    description=_prompt("""
     Develop a safe, medically-informed exercise plan based on blood test results, health status, and fitness level.
     
     User Query: {query}
@@ -285,8 +373,8 @@ exercise_planning = Task(
     - Provide modifications for health limitations identified in blood work
     - Recommend medical clearance when cardiovascular or metabolic concerns exist
     - Ensure exercise plan complements nutritional interventions
-    """,
-    expected_output="""
+    """),
+    expected_output=_prompt("""
     Comprehensive, medically-informed exercise plan including:
     
     1. EXERCISE READINESS ASSESSMENT:
@@ -334,16 +422,17 @@ exercise_planning = Task(
        - Evidence-based exercise prescription principles
     
     Format: Progressive exercise prescription with comprehensive safety protocols and medical considerations
-    """,
-    agent=doctor,
+    """),
+    agent=exercise_specialist,  # Mid-tier model for structured exercise plans
     tools=[read_blood_test_report, search_tool],  # FIXED: Use correct tool functions
     async_execution=False,
     context=[verification, help_patients, nutrition_analysis],  # BUG #5 FIX: Depends on ALL previous analyses
 )
 
 ## BUG #5 FIX: Add Integrated Health Summary Task
-integrated_health_summary = Task(
-    description="""
+integrated_health_summary = WorkflowTask(
+    name="integrated_health_summary",
+    description=_prompt("""
     Create a comprehensive health summary integrating all analysis results into a cohesive, actionable plan.
     
     WORKFLOW CONTEXT: This is the final integration task that synthesizes findings from document verification,
@@ -364,8 +453,8 @@ integrated_health_summary = Task(
     - Ensure medical safety takes priority over other considerations
     - Provide clear escalation paths for concerning findings
     - Include comprehensive disclaimers and safety information
-    """,
-    expected_output="""
+    """),
+    expected_output=_prompt("""
     Integrated health summary including:
     
     1. EXECUTIVE SUMMARY:
@@ -405,7 +494,7 @@ integrated_health_summary = Task(
        - Escalation procedures for concerning developments
     
     Format: Executive-level health summary suitable for patient and healthcare provider coordination
-    """,
+    """),
     agent=doctor,
     tools=[search_tool],  # FIXED: Use correct tool function
     async_execution=False,
@@ -421,39 +510,66 @@ TASK_SEQUENCE = [
     integrated_health_summary # Step 5: Integrated summary (depends on all previous analyses)
 ]
 
+# Medical analysis stays in the direct context of the later tasks to guard against
+# details drifting out through the chain of intermediate summaries
+PINNED_CONTEXT = {
+    "exercise_planning": ("help_patients",),
+    "integrated_health_summary": ("help_patients",),
+}
+
+def reduce_task_context(tasks, pinned=PINNED_CONTEXT):
+    """
+    Transitive reduction of the context DAG - drop a dependency that is already reachable
+    through another dependency, so each prompt carries its immediate parents only.
+    ``tasks`` must be in execution order.
+    """
+    ancestors = {}
+    for task in tasks:
+        deps = task.context if isinstance(task.context, list) else []
+        reachable = set()
+        for dep_task in deps:
+            reachable |= ancestors.get(id(dep_task), set())
+
+        keep = pinned.get(task.name, ())
+        ancestors[id(task)] = reachable | {id(dep_task) for dep_task in deps}
+        if deps:
+            task.context = [
+                dep_task for dep_task in deps
+                if id(dep_task) not in reachable or dep_task.name in keep
+            ]
+
+reduce_task_context(TASK_SEQUENCE)
+
 ## BUG #5 FIX: Task dependency validation function
 def validate_task_dependencies():
     """
     Validate that task dependencies are properly configured for logical workflow
     """
-    print("🔍 Validating task dependency structure...")
+    logger.debug("🔍 Validating task dependency structure...")
     
     # Verify task sequence order
     expected_sequence = [verification, help_patients, nutrition_analysis, exercise_planning, integrated_health_summary]
     
     for i, task in enumerate(TASK_SEQUENCE):
-        print(f"  ✓ Task {i+1}: {task.description.split('.')[0][:50]}...")
+        logger.debug("  ✓ Task %d: %s...", i + 1, task._title)
+        
+        # context is a declared field; CrewAI leaves a NOT_SPECIFIED sentinel when unset
+        deps = task.context if isinstance(task.context, list) else ()
         
-        if i == 0:  # First task should have no dependencies
-            if hasattr(task, 'context') and task.context:
-                raise ValueError(f"First task {task} should not have dependencies")
-        else:  # Subsequent tasks should have proper context
-            if not hasattr(task, 'context') or not task.context:
-                raise ValueError(f"Task {task} should have context dependencies")
-            
-            # Verify dependencies come before current task
-            for dep_task in task.context:
-                if dep_task not in TASK_SEQUENCE[:i]:
-                    raise ValueError(f"Task {task} depends on {dep_task} which comes later in sequence")
-    
-    print("✅ Task dependency validation passed")
-    print(f"✅ Workflow: verification → medical → nutrition → exercise → summary")
+        # Verify dependencies come before current task
+        for dep_task in deps:
+            if dep_task not in TASK_SEQUENCE[:i]:
+                raise ValueError(f"Task {task} depends on {dep_task} which comes later in sequence")
+    
+    logger.debug("✅ Task dependency validation passed")
+    logger.debug("✅ Workflow: verification → medical → nutrition → exercise → summary")
     return True
 
-# Automatically validate dependencies when module is imported
-try:
-    validate_task_dependencies()
-    print("🎯 Task workflow is properly configured!")
-except Exception as e:
-    print(f"❌ Task dependency error: {e}")
-    raise
\ No newline at end of file
+# Validate dependencies on import only when debug logging is switched on
+if logger.isEnabledFor(logging.DEBUG):
+    try:
+        validate_task_dependencies()
+        logger.debug("🎯 Task workflow is properly configured!")
+    except Exception as e:
+        logger.error("❌ Task dependency error: %s", e)
+        raise
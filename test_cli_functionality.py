@@ -4,292 +4,490 @@ VWO GenAI Internship Assignment - CLI Functionality Testing Script
 Tests the actual CLI application functionality and user workflows
 """
 
+import os
+import re
+import json
+import functools
+import compileall
+import multiprocessing
+import select
+import selectors
+import threading
 import subprocess
 import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import sys
 
+TEST_TIMEOUT = 30  # seconds
+
+# Modules every main.py child imports; only these are byte-compiled ahead of the run
+APP_MODULES = ('main.py', 'agents.py', 'task.py', 'tools.py')
+
+# The suite creates data/ and logs/ once; children are told to skip their own mkdir calls
+# and never read or write the user's run cache
+CHILD_ENV = {**os.environ, "VWO_SKIP_DIR_INIT": "1", "BLOOD_TEST_NO_CACHE": "1"}
+
+# Spawn options shared by every child. Children stay in the tester's process group so
+# Ctrl-C reaches them too; no preexec_fn/pass_fds keeps CPython on its vfork() fast path
+SPAWN_OPTIONS = {"env": CHILD_ENV}
+
+TEST_BLOOD_CONTENT = """
+COMPREHENSIVE BLOOD TEST REPORT
+Laboratory: VWO Test Lab
+Date: 2025-06-29
+
+COMPLETE BLOOD COUNT (CBC):
+White Blood Cells: 7.2 K/uL (Normal: 4.0-11.0)
+Red Blood Cells: 4.5 M/uL (Normal: 4.2-5.9)
+Hemoglobin: 14.2 g/dL (Normal: 12.0-16.0)
+
+BASIC METABOLIC PANEL:
+Glucose: 95 mg/dL (Normal: 70-100)
+Cholesterol: 185 mg/dL (Normal: <200)
+"""
+
+VALIDATION_CHECKS = [
+    'Task workflow dependencies validated',
+    'Multi-agent system (doctor + verifier) ready',
+    'Tool integration (file reader + search) confirmed',
+    'Required directories initialized',
+    'All system validations passed'
+]
+
+def compile_needles(needles) -> re.Pattern:
+    """One alternation for all needles so output is scanned once instead of once per needle"""
+    return re.compile("|".join(re.escape(needle) for needle in needles))
+
+VALIDATION_RE = compile_needles(VALIDATION_CHECKS)
+
+# Opt-in: serve every CLI run from one persistent `main.py --test-stdin-protocol` child
+USE_TEST_PROTOCOL = os.getenv("VWO_TEST_PROTOCOL") == "1"
+TEST_PROTOCOL_PREFIX = "@@vwo-test "
+
+class TestRunner:
+    """Owns one long-lived main.py child and exchanges one JSON line per CLI run"""
+
+    def __init__(self):
+        self.proc = None
+
+    def start(self):
+        # Unbuffered binary pipe so select() never misses data sitting in a Python buffer
+        self.proc = subprocess.Popen(
+            [sys.executable, 'main.py', '--test-stdin-protocol'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+            **SPAWN_OPTIONS
+        )
+
+    def close(self):
+        if self.proc is not None:
+            self.proc.kill()
+            self.proc.wait()
+            self.proc = None
+
+    def run(self, args, stdin_text=None, timeout=TEST_TIMEOUT) -> subprocess.CompletedProcess:
+        """Send one run request and wait for its prefixed response line"""
+        if self.proc is None or self.proc.poll() is not None:
+            self.start()
+
+        request = {"args": list(args), "stdin": stdin_text or ""}
+        self.proc.stdin.write((json.dumps(request) + "\n").encode("utf-8"))
+        try:
+            return self._read_response(args, timeout)
+        except KeyboardInterrupt:
+            self.close()
+            raise
+
+    def _read_response(self, args, timeout) -> subprocess.CompletedProcess:
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self.proc.stdout], [], [], remaining)[0]:
+                self.close()
+                raise subprocess.TimeoutExpired(['main.py', *args], timeout)
+
+            line = self.proc.stdout.readline().decode("utf-8", errors="replace")
+            if not line:
+                self.close()
+                raise RuntimeError("Test protocol child exited")
+            if line.startswith(TEST_PROTOCOL_PREFIX):
+                response = json.loads(line[len(TEST_PROTOCOL_PREFIX):])
+                return subprocess.CompletedProcess(args, response["rc"], response["stdout"], response["stderr"])
+
+_test_runner = None
+
+def run_main(args, stdin_text=None, capture_stderr=True):
+    """Run the CLI with the given arguments and captured output"""
+    global _test_runner
+    if USE_TEST_PROTOCOL:
+        if _test_runner is None:
+            _test_runner = TestRunner()
+        try:
+            return _test_runner.run(args, stdin_text)
+        except (OSError, RuntimeError, ValueError):
+            _test_runner.close()  # Child died - fall back to a fresh process for this run
+
+    return run_cli([sys.executable, 'main.py', *args], stdin_text, capture_stderr=capture_stderr)
+
+def run_cli(argv, stdin_text=None, timeout=TEST_TIMEOUT, capture_stderr=True) -> subprocess.CompletedProcess:
+    """
+    Run a command and drain stdout/stderr with a selector, returning as soon as both
+    pipes hit EOF and the child is reaped rather than on a polling interval.
+    Checks that only look at stdout pass capture_stderr=False so stderr goes to /dev/null.
+    """
+    proc = subprocess.Popen(
+        argv,
+        stdin=subprocess.PIPE if stdin_text is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE if capture_stderr else subprocess.DEVNULL,
+        **SPAWN_OPTIONS
+    )
+    if stdin_text is not None:
+        try:
+            proc.stdin.write(stdin_text.encode("utf-8"))
+        except BrokenPipeError:
+            pass  # Child exited before reading its input
+        proc.stdin.close()
+
+    pipes = [proc.stdout, proc.stderr] if capture_stderr else [proc.stdout]
+    output = {pipe: [] for pipe in pipes}
+    deadline = time.monotonic() + timeout
+    try:
+        with selectors.DefaultSelector() as selector:
+            for pipe in pipes:
+                selector.register(pipe, selectors.EVENT_READ)
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(argv, timeout)
+                for key, _ in selector.select(remaining):
+                    data = os.read(key.fd, 65536)
+                    if data:
+                        output[key.fileobj].append(data)
+                    else:
+                        selector.unregister(key.fileobj)
+        returncode = proc.wait(timeout=max(deadline - time.monotonic(), 0))
+    except BaseException:
+        # Timeout or Ctrl-C: never leave a CLI run (and its LLM calls) going behind us
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        for pipe in pipes:
+            pipe.close()
+
+    stdout = b"".join(output[proc.stdout]).decode("utf-8", errors="replace")
+    stderr = b"".join(output[proc.stderr]).decode("utf-8", errors="replace") if capture_stderr else ""
+    return subprocess.CompletedProcess(argv, returncode, stdout, stderr)
+
+def run_until_match(args, stdin_text, needles, timeout=TEST_TIMEOUT, merge_stderr=True):
+    """
+    Stream a CLI run line by line and stop the child as soon as any needle appears.
+    Returns (first matched needle or None, output seen so far).
+    With merge_stderr=False only stdout is scanned and stderr is discarded.
+    """
+    needle_re = compile_needles(needles)
+    if USE_TEST_PROTOCOL:
+        result = run_main(args, stdin_text)
+        output = result.stdout + result.stderr if merge_stderr else result.stdout
+        match = needle_re.search(output)
+        return (match.group(0) if match else None), output
+
+    proc = subprocess.Popen(
+        [sys.executable, 'main.py', *args],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT if merge_stderr else subprocess.DEVNULL,
+        text=True,
+        encoding='utf-8',
+        errors='replace',
+        bufsize=1,
+        **SPAWN_OPTIONS
+    )
+    timed_out = threading.Event()
+
+    def kill_on_timeout():
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, kill_on_timeout)
+    timer.start()
+    try:
+        if stdin_text:
+            try:
+                proc.stdin.write(stdin_text)
+            except BrokenPipeError:
+                pass  # Child exited before reading its input
+        proc.stdin.close()
+
+        matched = None
+        lines = []
+        for line in proc.stdout:
+            lines.append(line)
+            match = needle_re.search(line)
+            if match:
+                matched = match.group(0)
+                proc.terminate()  # Answer is known - skip the rest of the run
+                break
+    except BaseException:
+        proc.kill()  # Ctrl-C or a broken pipe - stop the child before waiting on it
+        raise
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        proc.wait()
+
+    if matched is None and timed_out.is_set():
+        raise subprocess.TimeoutExpired(args, timeout)
+    return matched, "".join(lines)
+
+def create_test_blood_file(suffix: str = '.txt', content: str = TEST_BLOOD_CONTENT) -> str:
+    """Create a temporary test file and return its path"""
+    with tempfile.NamedTemporaryFile(mode='w', suffix=suffix, delete=False) as temp_file:
+        temp_file.write(content)
+    return temp_file.name
+
+# Temp files that outlive a single check; removed by CLIFunctionalTester.cleanup()
+TEMP_FILE_REGISTRY = []
+
+@functools.lru_cache(maxsize=1)
+def shared_test_blood_file() -> str:
+    """
+    Blood test file shared by every check that only needs valid content. Created once in
+    the parent before the worker pool starts, so forked workers reuse the same path.
+    """
+    fd, path = tempfile.mkstemp(suffix='.txt')
+    with os.fdopen(fd, 'w') as temp_file:
+        temp_file.write(TEST_BLOOD_CONTENT)
+    TEMP_FILE_REGISTRY.append(path)
+    return path
+
+def run_main_with_shared_file(args, stdin_text):
+    """Run the CLI against the suite-wide blood test file"""
+    return run_main(['-f', shared_test_blood_file(), *args], stdin_text)
+
+def check_help_command():
+    result = run_main(['--help'], capture_stderr=False)
+    if result.returncode == 0 and 'VWO Blood Test Analysis' in result.stdout:
+        return True, "Help text displays correctly"
+    return False, f"Return code: {result.returncode}"
+
+def check_version_command():
+    result = run_main(['--version'], capture_stderr=False)
+    if result.returncode == 0 and '2.0.0' in result.stdout:
+        return True, "Version displays correctly"
+    return False, f"Return code: {result.returncode}"
+
+def check_missing_file():
+    matched, _ = run_until_match(['--dry-run-validate', '-f', 'nonexistent_file.pdf', '-q', 'Test query'], None, ['File not found'])
+    if matched == 'File not found':
+        return True, "Correctly rejects missing files"
+    return False, "Should reject missing files"
+
+def check_invalid_file_type():
+    # Fake image file
+    fake_image = create_test_blood_file(suffix='.jpg', content="fake image content")
+    try:
+        matched, _ = run_until_match(['--dry-run-validate', '-f', fake_image, '-q', 'Test query'], None, ['Unsupported file format'])
+    finally:
+        Path(fake_image).unlink()
+    if matched == 'Unsupported file format':
+        return True, "Correctly rejects unsupported formats"
+    return False, "Should reject unsupported formats"
+
+def check_short_query():
+    # Negative path only needs the validation stage - skip the AI system entirely
+    result = run_main_with_shared_file(['--dry-run-validate', '-q', 'x'], None)
+    if 'must be at least' in result.stdout or 'too short' in result.stderr:
+        return True, "Correctly rejects short queries"
+    return False, "Should reject short queries"
+
+def check_valid_query(result):
+    if 'Query validated' in result.stdout:
+        return True, "Accepts properly formatted queries"
+    return False, "Should accept valid queries"
+
+def check_system_validation():
+    # Run with valid inputs and stop once the validation stage has reported either way
+    _, output = run_until_match(
+        ['-f', shared_test_blood_file(), '-q', 'Test system validation'], 'yes\n',
+        ['All system validations passed', 'System not fully configured'],
+        merge_stderr=False  # Validation results are all printed to stdout
+    )
+    passed_validations = len(set(VALIDATION_RE.findall(output)))
+    if passed_validations >= 4:
+        return True, f"Passed {passed_validations}/5 validation checks"
+    return False, f"Only {passed_validations}/5 validations passed"
+
+def check_disclaimer_accept(result):
+    if CLIFunctionalTester.DISCLAIMER_RE.search(result.stdout) is not None:
+        return True, "Displays and processes disclaimer correctly"
+    return False, "Disclaimer not properly displayed"
+
+def check_disclaimer_reject(result):
+    if 'Analysis cancelled for safety compliance' in result.stdout:
+        return True, "Properly handles disclaimer rejection"
+    return False, "Should cancel on disclaimer rejection"
+
+# Checks that only differ by query and disclaimer answer against the shared file; they take
+# the captured result as an argument. The LLM-bound ones share one `main.py --batch-queries`
+# run; the rejection needs no LLM, so it stays a short run of its own.
+BATCHED_QUERIES = {
+    "Valid query acceptance": ('Analyze my cholesterol levels', 'yes'),
+    "Medical disclaimer display": ('Test disclaimer', 'yes'),
+}
+QUERY_CHECKS = {
+    **BATCHED_QUERIES,
+    "Medical disclaimer rejection": ('Test disclaimer rejection', 'no'),
+}
+
+# Each check creates any temp files it needs, runs main.py once and returns (success, details),
+# so checks share no state and can run in separate worker processes
+
+def run_check(test_name: str, check, result=None) -> dict:
+    """Worker entry point - run one check (or judge a captured batch result) and return its log record"""
+    try:
+        if test_name in QUERY_CHECKS:
+            if result is None:
+                query, answer = QUERY_CHECKS[test_name]
+                result = run_main_with_shared_file(['-q', query], answer + '\n')
+            success, details = check(result)
+        else:
+            success, details = check()
+    except subprocess.TimeoutExpired:
+        success, details = False, "Command timed out"
+    except Exception as e:
+        success, details = False, f"Error: {e}"
+    return {'test': test_name, 'success': success, 'details': details}
+
+# (category, test name, check) in the order results are reported
+CLI_CHECKS = [
+    ("CLI Help Commands", "Help command", check_help_command),
+    ("CLI Help Commands", "Version command", check_version_command),
+    ("File Validation", "Non-existent file handling", check_missing_file),
+    ("File Validation", "Invalid file type handling", check_invalid_file_type),
+    ("Query Validation", "Short query validation", check_short_query),
+    ("Query Validation", "Valid query acceptance", check_valid_query),
+    ("System Validation", "System validation", check_system_validation),
+    ("Medical Disclaimer Flow", "Medical disclaimer display", check_disclaimer_accept),
+    ("Medical Disclaimer Flow", "Medical disclaimer rejection", check_disclaimer_reject),
+]
+
+CHECKS_BY_NAME = {test_name: check for _, test_name, check in CLI_CHECKS}
+
+def run_batched_checks() -> list:
+    """
+    Serve every BATCHED_QUERIES check from a single `main.py --batch-queries` process.
+    Each record gets its own TEST_TIMEOUT, so one slow analysis only fails the records it held
+    up, and the child is stopped as soon as every record has answered.
+    """
+    fd, batch_path = tempfile.mkstemp(suffix='.jsonl')
+    with os.fdopen(fd, 'w') as batch_file:
+        for query, answer in BATCHED_QUERIES.values():
+            batch_file.write(json.dumps({"q": query, "disc": answer}) + "\n")
+
+    responses = []
+    timed_out = False
+    # Unbuffered binary pipe so select() never misses data sitting in a Python buffer
+    proc = subprocess.Popen(
+        [sys.executable, 'main.py', '--batch-queries', batch_path, '-f', shared_test_blood_file()],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,  # Responses carry each run's own stderr on stdout
+        bufsize=0,
+        **SPAWN_OPTIONS
+    )
+    try:
+        deadline = time.monotonic() + TEST_TIMEOUT
+        while len(responses) < len(BATCHED_QUERIES):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([proc.stdout], [], [], remaining)[0]:
+                timed_out = True
+                break
+            line = proc.stdout.readline().decode("utf-8", errors="replace")
+            if not line:
+                break  # Child exited early
+            if line.startswith(TEST_PROTOCOL_PREFIX):
+                responses.append(json.loads(line[len(TEST_PROTOCOL_PREFIX):]))
+                deadline = time.monotonic() + TEST_TIMEOUT
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        returncode = proc.wait()
+        proc.stdout.close()
+        Path(batch_path).unlink()
+
+    records = []
+    for index, test_name in enumerate(BATCHED_QUERIES):
+        if index >= len(responses):
+            details = "Command timed out" if timed_out else f"No batch response (return code: {returncode})"
+            records.append({'test': test_name, 'success': False, 'details': details})
+            continue
+        response = responses[index]
+        result = subprocess.CompletedProcess(proc.args, response["rc"], response["stdout"], response["stderr"])
+        records.append(run_check(test_name, CHECKS_BY_NAME[test_name], result))
+    return records
+
 class CLIFunctionalTester:
     """Test CLI application functionality and user workflows"""
-    
+
+    # Disclaimer banner followed by the acknowledgement - one pass over the output
+    DISCLAIMER_RE = re.compile(r"IMPORTANT MEDICAL DISCLAIMER.*?Medical disclaimer acknowledged", re.S)
+
     def __init__(self):
         self.test_results = []
-        self.temp_files = []
-        self.test_timeout = 30  # seconds
-    
+        self.temp_files = TEMP_FILE_REGISTRY
+        self._log_buf = []  # Report lines, written in one go by flush_log()
+        self.test_timeout = TEST_TIMEOUT
+
     def cleanup(self):
         """Clean up temporary test files"""
         for temp_file in self.temp_files:
-            try:
-                if Path(temp_file).exists():
-                    Path(temp_file).unlink()
-            except:
-                pass
-    
+            Path(temp_file).unlink(missing_ok=True)
+        self.temp_files.clear()
+        shared_test_blood_file.cache_clear()
+
     def log_test(self, test_name: str, success: bool, details: str = ""):
         """Log test results"""
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"  {status}: {test_name}")
+        self._log_buf.append(f"  {status}: {test_name}\n")
         if details:
-            print(f"    💬 {details}")
-        
+            self._log_buf.append(f"    💬 {details}\n")
+
         self.test_results.append({
             'test': test_name,
             'success': success,
             'details': details
         })
-    
-    def create_test_blood_file(self, filename: str = None) -> str:
-        """Create a test blood test file"""
-        if filename is None:
-            temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False)
-            filename = temp_file.name
-            self.temp_files.append(filename)
-        else:
-            temp_file = open(filename, 'w')
-        
-        test_content = """
-COMPREHENSIVE BLOOD TEST REPORT
-Laboratory: VWO Test Lab
-Date: 2025-06-29
 
-COMPLETE BLOOD COUNT (CBC):
-White Blood Cells: 7.2 K/uL (Normal: 4.0-11.0)
-Red Blood Cells: 4.5 M/uL (Normal: 4.2-5.9)
-Hemoglobin: 14.2 g/dL (Normal: 12.0-16.0)
+    def run_checks_parallel(self) -> list:
+        """Run every CLI check in a process pool; results come back in CLI_CHECKS order"""
+        records = {}
+        jobs = [(run_check, (test_name, check), [test_name])
+                for _, test_name, check in CLI_CHECKS if test_name not in BATCHED_QUERIES]
+        jobs.append((run_batched_checks, (), list(BATCHED_QUERIES)))
+
+        max_workers = min(len(jobs), os.cpu_count() or 1)
+        # Forked workers start without re-importing this script and see the shared fixture path
+        mp_context = multiprocessing.get_context('fork') if sys.platform.startswith('linux') else None
+
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+            futures = {executor.submit(job, *job_args): test_names for job, job_args, test_names in jobs}
+            for future in as_completed(futures):
+                try:
+                    job_records = future.result()
+                except Exception as e:
+                    job_records = [{'test': test_name, 'success': False, 'details': f"Error: {e}"}
+                                   for test_name in futures[future]]
+                for record in (job_records if isinstance(job_records, list) else [job_records]):
+                    records[record['test']] = record
+
+        return [records[test_name] for _, test_name, _ in CLI_CHECKS]
 
-BASIC METABOLIC PANEL:
-Glucose: 95 mg/dL (Normal: 70-100)
-Cholesterol: 185 mg/dL (Normal: <200)
-"""
-        temp_file.write(test_content)
-        temp_file.close()
-        
-        return filename
-    
-    def test_cli_help_commands(self):
-        """Test CLI help and version commands"""
-        print("\n🔍 Testing CLI Help Commands...")
-        
-        # Test --help
-        try:
-            result = subprocess.run(
-                [sys.executable, 'main.py', '--help'],
-                capture_output=True,
-                text=True,
-                timeout=self.test_timeout
-            )
-            
-            if result.returncode == 0 and 'VWO Blood Test Analysis' in result.stdout:
-                self.log_test("Help command", True, "Help text displays correctly")
-            else:
-                self.log_test("Help command", False, f"Return code: {result.returncode}")
-                
-        except subprocess.TimeoutExpired:
-            self.log_test("Help command", False, "Command timed out")
-        except Exception as e:
-            self.log_test("Help command", False, f"Error: {e}")
-        
-        # Test --version
-        try:
-            result = subprocess.run(
-                [sys.executable, 'main.py', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=self.test_timeout
-            )
-            
-            if result.returncode == 0 and '2.0.0' in result.stdout:
-                self.log_test("Version command", True, "Version displays correctly")
-            else:
-                self.log_test("Version command", False, f"Return code: {result.returncode}")
-                
-        except subprocess.TimeoutExpired:
-            self.log_test("Version command", False, "Command timed out")
-        except Exception as e:
-            self.log_test("Version command", False, f"Error: {e}")
-    
-    def test_file_validation(self):
-        """Test file validation functionality"""
-        print("\n🔍 Testing File Validation...")
-        
-        # Test 1: Non-existent file
-        try:
-            result = subprocess.run(
-                [sys.executable, 'main.py', '-f', 'nonexistent_file.pdf', '-q', 'Test query'],
-                input='yes\n',  # Accept disclaimer
-                capture_output=True,
-                text=True,
-                timeout=self.test_timeout
-            )
-            
-            if 'File not found' in result.stdout or 'not found' in result.stderr:
-                self.log_test("Non-existent file handling", True, "Correctly rejects missing files")
-            else:
-                self.log_test("Non-existent file handling", False, "Should reject missing files")
-                
-        except subprocess.TimeoutExpired:
-            self.log_test("Non-existent file handling", False, "Command timed out")
-        except Exception as e:
-            self.log_test("Non-existent file handling", False, f"Error: {e}")
-        
-        # Test 2: Invalid file type
-        try:
-            # Create fake image file
-            fake_image = tempfile.NamedTemporaryFile(mode='w', suffix='.jpg', delete=False)
-            fake_image.write("fake image content")
-            fake_image.close()
-            self.temp_files.append(fake_image.name)
-            
-            result = subprocess.run(
-                [sys.executable, 'main.py', '-f', fake_image.name, '-q', 'Test query'],
-                input='yes\n',
-                capture_output=True,
-                text=True,
-                timeout=self.test_timeout
-            )
-            
-            if 'Unsupported file format' in result.stdout or 'not supported' in result.stderr:
-                self.log_test("Invalid file type handling", True, "Correctly rejects unsupported formats")
-            else:
-                self.log_test("Invalid file type handling", False, "Should reject unsupported formats")
-                
-        except subprocess.TimeoutExpired:
-            self.log_test("Invalid file type handling", False, "Command timed out")
-        except Exception as e:
-            self.log_test("Invalid file type handling", False, f"Error: {e}")
-    
-    def test_query_validation(self):
-        """Test query validation functionality"""
-        print("\n🔍 Testing Query Validation...")
-        
-        # Create valid test file
-        test_file = self.create_test_blood_file()
-        
-        # Test 1: Too short query
-        try:
-            result = subprocess.run(
-                [sys.executable, 'main.py', '-f', test_file, '-q', 'x'],
-                input='yes\n',
-                capture_output=True,
-                text=True,
-                timeout=self.test_timeout
-            )
-            
-            if 'must be at least' in result.stdout or 'too short' in result.stderr:
-                self.log_test("Short query validation", True, "Correctly rejects short queries")
-            else:
-                self.log_test("Short query validation", False, "Should reject short queries")
-                
-        except subprocess.TimeoutExpired:
-            self.log_test("Short query validation", False, "Command timed out")
-        except Exception as e:
-            self.log_test("Short query validation", False, f"Error: {e}")
-        
-        # Test 2: Valid query
-        try:
-            result = subprocess.run(
-                [sys.executable, 'main.py', '-f', test_file, '-q', 'Analyze my cholesterol levels'],
-                input='yes\n',
-                capture_output=True,
-                text=True,
-                timeout=self.test_timeout
-            )
-            
-            if 'Query validated' in result.stdout:
-                self.log_test("Valid query acceptance", True, "Accepts properly formatted queries")
-            else:
-                self.log_test("Valid query acceptance", False, "Should accept valid queries")
-                
-        except subprocess.TimeoutExpired:
-            self.log_test("Valid query acceptance", False, "Command timed out")
-        except Exception as e:
-            self.log_test("Valid query acceptance", False, f"Error: {e}")
-    
-    def test_system_validation(self):
-        """Test system validation on startup"""
-        print("\n🔍 Testing System Validation...")
-        
-        # Create valid test file
-        test_file = self.create_test_blood_file()
-        
-        try:
-            # Run with valid inputs to check system validation
-            result = subprocess.run(
-                [sys.executable, 'main.py', '-f', test_file, '-q', 'Test system validation'],
-                input='yes\n',
-                capture_output=True,
-                text=True,
-                timeout=self.test_timeout
-            )
-            
-            validation_checks = [
-                'Task workflow dependencies validated',
-                'Multi-agent system (doctor + verifier) ready',
-                'Tool integration (file reader + search) confirmed',
-                'Required directories initialized',
-                'All system validations passed'
-            ]
-            
-            passed_validations = sum(1 for check in validation_checks if check in result.stdout)
-            
-            if passed_validations >= 4:
-                self.log_test("System validation", True, f"Passed {passed_validations}/5 validation checks")
-            else:
-                self.log_test("System validation", False, f"Only {passed_validations}/5 validations passed")
-                
-        except subprocess.TimeoutExpired:
-            self.log_test("System validation", False, "Command timed out")
-        except Exception as e:
-            self.log_test("System validation", False, f"Error: {e}")
-    
-    def test_medical_disclaimer_flow(self):
-        """Test medical disclaimer acceptance flow"""
-        print("\n🔍 Testing Medical Disclaimer Flow...")
-        
-        test_file = self.create_test_blood_file()
-        
-        # Test 1: Disclaimer acceptance
-        try:
-            result = subprocess.run(
-                [sys.executable, 'main.py', '-f', test_file, '-q', 'Test disclaimer'],
-                input='yes\n',
-                capture_output=True,
-                text=True,
-                timeout=self.test_timeout
-            )
-            
-            if 'IMPORTANT MEDICAL DISCLAIMER' in result.stdout and 'Medical disclaimer acknowledged' in result.stdout:
-                self.log_test("Medical disclaimer display", True, "Displays and processes disclaimer correctly")
-            else:
-                self.log_test("Medical disclaimer display", False, "Disclaimer not properly displayed")
-                
-        except subprocess.TimeoutExpired:
-            self.log_test("Medical disclaimer display", False, "Command timed out")
-        except Exception as e:
-            self.log_test("Medical disclaimer display", False, f"Error: {e}")
-        
-        # Test 2: Disclaimer rejection
-        try:
-            result = subprocess.run(
-                [sys.executable, 'main.py', '-f', test_file, '-q', 'Test disclaimer rejection'],
-                input='no\n',
-                capture_output=True,
-                text=True,
-                timeout=self.test_timeout
-            )
-            
-            if 'Analysis cancelled for safety compliance' in result.stdout:
-                self.log_test("Medical disclaimer rejection", True, "Properly handles disclaimer rejection")
-            else:
-                self.log_test("Medical disclaimer rejection", False, "Should cancel on disclaimer rejection")
-                
-        except subprocess.TimeoutExpired:
-            self.log_test("Medical disclaimer rejection", False, "Command timed out")
-        except Exception as e:
-            self.log_test("Medical disclaimer rejection", False, f"Error: {e}")
-    
     def run_all_tests(self):
         """Run all CLI functionality tests"""
         print("🧪 VWO GenAI Internship Assignment - CLI Functionality Testing")
@@ -297,53 +495,71 @@ Cholesterol: 185 mg/dL (Normal: <200)
         print("🔬 Testing CLI application functionality and user workflows")
         print("📋 Validating bug fixes and user experience")
         print("=" * 70)
-        
-        # Ensure data directory exists
-        Path("data").mkdir(exist_ok=True)
-        
-        test_functions = [
-            ("CLI Help Commands", self.test_cli_help_commands),
-            ("File Validation", self.test_file_validation),
-            ("Query Validation", self.test_query_validation),
-            ("System Validation", self.test_system_validation),
-            ("Medical Disclaimer Flow", self.test_medical_disclaimer_flow),
-        ]
-        
-        for test_name, test_function in test_functions:
-            try:
-                test_function()
-            except Exception as e:
-                print(f"\n❌ {test_name} test failed: {e}")
-                self.log_test(f"{test_name} (category)", False, f"Test category failed: {e}")
-        
+
+        # Suite-level directory setup - children skip theirs via VWO_SKIP_DIR_INIT
+        for dir_name in ("data", "logs"):
+            Path(dir_name).mkdir(exist_ok=True)
+
+        # Shared fixture file is written once, before any worker starts
+        shared_test_blood_file()
+
+        # Warm bytecode for the application modules so every main.py spawn skips compiling them
+        for module_file in APP_MODULES:
+            compileall.compile_file(module_file, quiet=1)
+
+        start_time = time.time()
+        if USE_TEST_PROTOCOL:
+            # One persistent child serves every run, so checks go through it in order
+            results = [run_check(test_name, check) for _, test_name, check in CLI_CHECKS]
+            if _test_runner is not None:
+                _test_runner.close()
+        else:
+            results = self.run_checks_parallel()
+        print(f"\n⏱️  {len(results)} CLI checks completed in {time.time() - start_time:.1f}s")
+
+        # Report in deterministic order once the pool has drained
+        current_category = None
+        for (category, _, _), result in zip(CLI_CHECKS, results):
+            if category != current_category:
+                current_category = category
+                self._log_buf.append(f"\n🔍 Testing {category}...\n")
+            self.log_test(result['test'], result['success'], result['details'])
+        self.flush_log()
+
         # Print summary
         self.print_summary()
-        
+
         # Cleanup
         self.cleanup()
-        
+
         return all(result['success'] for result in self.test_results)
-    
+
+    def flush_log(self):
+        """Write all buffered report lines with a single call"""
+        sys.stdout.writelines(self._log_buf)
+        sys.stdout.flush()
+        self._log_buf.clear()
+
     def print_summary(self):
         """Print test summary"""
         total_tests = len(self.test_results)
         passed_tests = sum(1 for result in self.test_results if result['success'])
         failed_tests = total_tests - passed_tests
-        
+
         print("\n" + "=" * 70)
         print("📊 CLI FUNCTIONALITY TESTING RESULTS")
         print("=" * 70)
-        
+
         print(f"✅ Passed: {passed_tests}")
         print(f"❌ Failed: {failed_tests}")
         print(f"📈 Success Rate: {(passed_tests/total_tests*100):.1f}%")
-        
+
         if failed_tests > 0:
             print(f"\n❌ FAILED TESTS:")
             for result in self.test_results:
                 if not result['success']:
                     print(f"   • {result['test']}: {result['details']}")
-        
+
         if failed_tests == 0:
             print(f"\n🎉 ALL CLI FUNCTIONALITY TESTS PASSED!")
             print(f"🚀 Your CLI application is fully functional!")
@@ -369,4 +585,4 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -2,40 +2,63 @@
 """
 VWO GenAI Internship Assignment - Integration Testing Script
 End-to-end testing of the complete blood test analysis workflow
+
+Pass --yes (or set CI in the environment) to skip the API-cost confirmation prompt
+for non-interactive runs.
 """
 
+import io
 import os
+import re
 import sys
-import tempfile
+import math
+import asyncio
+import contextlib
+import argparse
+import hashlib
 import time
+from dataclasses import dataclass
+from functools import lru_cache, partial
 from pathlib import Path
 from dotenv import load_dotenv
 
+# pytest is only needed for the parallel `pytest -n auto` entry points below
+try:
+    import pytest
+    PYTEST_AVAILABLE = True
+except ImportError:
+    PYTEST_AVAILABLE = False
+
+# Optional: vcrpy replays recorded OpenAI responses so the workflow test runs offline
+try:
+    import vcr
+    VCR_AVAILABLE = True
+except ImportError:
+    VCR_AVAILABLE = False
+
+# Optional: aiofiles for the concurrent stat() mode; asyncio.to_thread is used without it
+try:
+    import aiofiles.os
+    AIOFILES_AVAILABLE = True
+except ImportError:
+    AIOFILES_AVAILABLE = False
+
 # Load environment
 load_dotenv()
 
-class IntegrationTester:
-    """End-to-end integration testing for CLI system"""
-    
-    def __init__(self):
-        self.test_results = []
-        self.setup_test_environment()
-    
-    def setup_test_environment(self):
-        """Set up test environment and files"""
-        print("🔧 Setting up integration test environment...")
-        
-        # Ensure required directories exist
-        for directory in ['data', 'logs']:
-            Path(directory).mkdir(exist_ok=True)
-        
-        # Create comprehensive test blood file
-        self.create_comprehensive_test_file()
-        print("  ✅ Test environment ready")
-    
-    def create_comprehensive_test_file(self):
-        """Create a comprehensive blood test file for integration testing"""
-        test_content = """
+ASYNC_STAT = os.getenv("VWO_ASYNC_STAT") == "1"
+
+# SKIP_OPENAI=1 leaves out the full analysis workflow; LIVE_OPENAI=1 runs it live and
+# (re)records its cassette. Cassettes hold report prompts and LLM output and are git-ignored.
+SKIP_OPENAI = os.getenv("SKIP_OPENAI") == "1"
+LIVE_OPENAI = os.getenv("LIVE_OPENAI") == "1"
+CASSETTE_DIR = Path("data/cassettes")
+
+DEFAULT_TEST_FILE = Path("data/integration_test_blood_report.txt")
+REQUIRED_FILES = ('main.py', 'agents.py', 'task.py', 'tools.py')
+
+# Kept as a bytes literal: the constant lives in co_consts and is written without an encode step
+_TEST_CONTENT_BYTES = b"""
 COMPREHENSIVE BLOOD TEST REPORT - INTEGRATION TEST
 Laboratory: VWO Medical Diagnostics Center
 Date Collected: 2025-06-29
@@ -95,32 +118,219 @@ Ferritin: 45 ng/mL (Reference: 12-150)
 End of Report - Integration Test Data
 Generated for VWO GenAI Internship Assignment Testing
 """
+_TEST_CONTENT_SHA1 = hashlib.sha1(_TEST_CONTENT_BYTES).hexdigest()
+
+def _atomic_write(path: Path, data: bytes):
+    """Write via a temp file in the same directory so readers never see a partial file"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)  # One write() of the exact length, no codec or buffer layer
+    os.replace(tmp_path, path)
+
+def elapsed_seconds(start_ns: int) -> float:
+    """Seconds since a perf_counter_ns() reading - monotonic, so clock steps cannot skew durations"""
+    return (time.perf_counter_ns() - start_ns) / 1e9
+
+def openai_cassette(name: str):
+    """
+    Replay HTTP traffic from CASSETTE_DIR/name when vcrpy is installed and a recording exists.
+    Recording is opt-in: only LIVE_OPENAI=1 makes fresh API calls that write (or overwrite) it;
+    without a recording the calls simply go out live and nothing is saved.
+    """
+    if not VCR_AVAILABLE or not (LIVE_OPENAI or (CASSETTE_DIR / name).exists()):
+        return contextlib.nullcontext()
+    recorder = vcr.VCR(
+        cassette_library_dir=str(CASSETTE_DIR),
+        record_mode='all' if LIVE_OPENAI else 'none',
+        filter_headers=['authorization', 'api-key', 'openai-organization'],
+        ignore_hosts=['telemetry.crewai.com'],
+    )
+    return recorder.use_cassette(name)
+
+async def _stat_concurrently(paths):
+    stat = aiofiles.os.stat if AIOFILES_AVAILABLE else partial(asyncio.to_thread, os.stat)
+    return await asyncio.gather(*(stat(path) for path in paths), return_exceptions=True)
+
+def stat_readiness_files(report_path):
+    """
+    Return (names of REQUIRED_FILES present, os.stat_result of the report or None).
+    By default one scandir covers the core files and one stat() the report. With
+    VWO_ASYNC_STAT=1 every path is stat()ed concurrently instead, which only pays off
+    on checkouts where each stat() is a network round trip (NFS and similar).
+    """
+    if ASYNC_STAT:
+        results = asyncio.run(_stat_concurrently([*REQUIRED_FILES, report_path]))
+        present = {name for name, result in zip(REQUIRED_FILES, results) if not isinstance(result, Exception)}
+        report_stat = results[-1]
+        return present, (None if isinstance(report_stat, Exception) else report_stat)
+    
+    with os.scandir('.') as entries:
+        present = {entry.name for entry in entries}
+    try:
+        return present, os.stat(report_path)
+    except OSError:
+        return present, None
+
+def normalized_digest(text: str) -> str:
+    """blake2b of the text with whitespace runs collapsed - report cleaning only reflows whitespace"""
+    return hashlib.blake2b(' '.join(text.split()).encode('utf-8'), digest_size=16).hexdigest()
+
+# What a lossless read of the fixture hashes to; derived from the constant so the two never drift
+EXPECTED_REPORT_DIGEST = normalized_digest(_TEST_CONTENT_BYTES.decode('utf-8'))
+
+# Sections and markers the file reader must preserve, matched in a single pass over the text
+KEY_MEDICAL_DATA = (
+    'COMPLETE BLOOD COUNT',
+    'METABOLIC PANEL',
+    'LIPID PANEL',
+    'LIVER FUNCTION',
+    'Hemoglobin',
+    'Cholesterol',
+    'Glucose',
+)
+KEY_MEDICAL_DATA_RE = re.compile("|".join(map(re.escape, KEY_MEDICAL_DATA)))
+KEY_MEDICAL_DATA_BYTES_RE = re.compile(b"|".join(re.escape(keyword.encode()) for keyword in KEY_MEDICAL_DATA))
+
+SCAN_CHUNK_SIZE = 131072
+
+def scan_stream(path, pattern: re.Pattern, max_match_len: int) -> set:
+    """
+    Collect the distinct matches of a bytes pattern in a file, chunk by chunk, so a large
+    report is never held in memory whole. Each chunk is prefixed with the tail of the previous
+    one (longest match minus one byte) so matches spanning a boundary are still seen.
+    """
+    overlap = max_match_len - 1
+    found = set()
+    tail = b""
+    with open(path, 'rb', buffering=SCAN_CHUNK_SIZE) as f:
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except (AttributeError, OSError):
+            pass  # Readahead hint is Linux/BSD only
+        while chunk := f.read1(SCAN_CHUNK_SIZE):
+            window = tail + chunk
+            found.update(pattern.findall(window))
+            tail = window[-overlap:] if overlap else b""
+    return found
+
+def lost_key_data(result: str, source_path) -> list:
+    """Key medical data present in the source file but missing from the reader's output, sorted"""
+    found = set(KEY_MEDICAL_DATA_RE.findall(result))
+    in_source = scan_stream(source_path, KEY_MEDICAL_DATA_BYTES_RE, max(map(len, KEY_MEDICAL_DATA)))
+    return sorted(keyword.decode() for keyword in in_source if keyword.decode() not in found)
+
+# Each analysis component is recognised by any of its keywords; one named group per component
+COMPONENTS = (
+    ('VERIFICATION', 'DOCUMENT'),
+    ('MEDICAL', 'BLOOD'),
+    ('NUTRITION', 'DIETARY'),
+    ('EXERCISE', 'PHYSICAL'),
+    ('SUMMARY', 'RECOMMENDATION'),
+)
+COMPONENTS_RE = re.compile(
+    r"\b(?:" + "|".join(f"(?P<g{i}>{'|'.join(keywords)})" for i, keywords in enumerate(COMPONENTS)) + ")",
+    re.IGNORECASE
+)
+
+# Both the import check and the workflow test need these; build them once per process.
+# The imports stay lazy so an import failure is reported by the test instead of at collection.
+@lru_cache(maxsize=1)
+def _analyzer():
+    # main checks sys.argv for -v/-h at import; hide the runner's own flags (e.g. pytest -v)
+    saved_argv = sys.argv
+    sys.argv = sys.argv[:1]
+    try:
+        from main import BloodTestAnalyzer
+    finally:
+        sys.argv = saved_argv
+    # The workflow test must run the crew, never replay a cached analysis
+    return BloodTestAnalyzer(use_cache=False)
+
+@lru_cache(maxsize=1)
+def _validated_task_sequence():
+    from task import TASK_SEQUENCE, validate_task_dependencies
+    validate_task_dependencies()
+    return TASK_SEQUENCE
+
+@dataclass(slots=True)
+class TestResult:
+    """One logged check - slots keep each record small and attribute access off the dict path"""
+    __test__ = False  # Not a pytest test class despite the name
+    
+    test: str
+    success: bool
+    details: str = ""
+    duration: float = 0.0
+
+class IntegrationTester:
+    """End-to-end integration testing for CLI system"""
+    
+    def __init__(self, test_file=None):
+        self.test_results = []
+        # Report lines collect here and reach stdout in one write per phase
+        self._out = io.StringIO()
+        self.setup_test_environment(test_file)
+    
+    def _print(self, text: str = ""):
+        """Queue one report line for the next flush_output()"""
+        self._out.write(text + "\n")
+    
+    def flush_output(self):
+        """Write every queued report line to stdout at once"""
+        sys.stdout.write(self._out.getvalue())
+        sys.stdout.flush()
+        self._out.seek(0)
+        self._out.truncate()
+    
+    def setup_test_environment(self, test_file=None):
+        """Set up test environment and files"""
+        self._print("🔧 Setting up integration test environment...")
         
-        test_file = Path("data/integration_test_blood_report.txt")
-        test_file.write_text(test_content)
+        # Ensure required directories exist
+        for directory in ['data', 'logs']:
+            Path(directory).mkdir(exist_ok=True)
+        
+        # Create comprehensive test blood file
+        self.create_comprehensive_test_file(test_file)
+        self._print("  ✅ Test environment ready")
+        self.flush_output()
+    
+    def create_comprehensive_test_file(self, test_file=None):
+        """
+        Create a comprehensive blood test file for integration testing.
+        pytest workers pass their own path so parallel sessions never share the file.
+        """
+        test_file = Path(test_file or DEFAULT_TEST_FILE)
         self.test_file_path = str(test_file)
-        print(f"  ✅ Created comprehensive test file: {test_file}")
+        
+        # Skip the rewrite when the sidecar digest shows the file already holds this content
+        digest_file = test_file.with_name(test_file.name + '.sha1')
+        try:
+            if (digest_file.read_text(errors='ignore') == _TEST_CONTENT_SHA1
+                    and test_file.stat().st_size == len(_TEST_CONTENT_BYTES)):
+                self._print(f"  ✅ Reusing comprehensive test file: {test_file}")
+                return
+        except OSError:
+            pass
+        
+        _atomic_write(test_file, _TEST_CONTENT_BYTES)
+        _atomic_write(digest_file, _TEST_CONTENT_SHA1.encode('ascii'))
+        self._print(f"  ✅ Created comprehensive test file: {test_file}")
     
     def log_test(self, test_name: str, success: bool, details: str = "", duration: float = 0):
         """Log test results with duration"""
         status = "✅ PASS" if success else "❌ FAIL"
         duration_str = f"({duration:.1f}s)" if duration > 0 else ""
-        print(f"  {status}: {test_name} {duration_str}")
+        self._print(f"  {status}: {test_name} {duration_str}")
         if details:
-            print(f"    💬 {details}")
+            self._print(f"    💬 {details}")
         
-        self.test_results.append({
-            'test': test_name,
-            'success': success,
-            'details': details,
-            'duration': duration
-        })
+        self.test_results.append(TestResult(test_name, success, details, duration))
     
     def test_environment_readiness(self):
         """Test that environment is ready for integration testing"""
-        print("\n🔍 Testing Environment Readiness...")
+        self._print("\n🔍 Testing Environment Readiness...")
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         # Check API key
         api_key = os.getenv('OPENAI_API_KEY')
@@ -131,36 +341,33 @@ Generated for VWO GenAI Internship Assignment Testing
             return False
         
         # Check core files
-        required_files = ['main.py', 'agents.py', 'task.py', 'tools.py']
-        for file_name in required_files:
-            if Path(file_name).exists():
+        present, report_stat = stat_readiness_files(self.test_file_path)
+        for file_name in REQUIRED_FILES:
+            if file_name in present:
                 self.log_test(f"Core file: {file_name}", True)
             else:
                 self.log_test(f"Core file: {file_name}", False, "Required for system operation")
                 return False
         
         # Check test file
-        if Path(self.test_file_path).exists():
-            file_size = Path(self.test_file_path).stat().st_size
-            self.log_test("Test blood report", True, f"{file_size} bytes comprehensive data")
-        else:
+        if report_stat is None:
             self.log_test("Test blood report", False, "Test file missing")
             return False
+        self.log_test("Test blood report", True, f"{report_stat.st_size} bytes comprehensive data")
         
-        duration = time.time() - start_time
+        duration = elapsed_seconds(start_ns)
         self.log_test("Environment readiness", True, "All components available", duration)
         return True
     
     def test_system_imports_and_validation(self):
         """Test system imports and validation without running analysis"""
-        print("\n🔍 Testing System Imports and Validation...")
+        self._print("\n🔍 Testing System Imports and Validation...")
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
             # Test main module import
-            from main import BloodTestAnalyzer
-            analyzer = BloodTestAnalyzer()
+            _analyzer()
             self.log_test("Main module import", True, "BloodTestAnalyzer class available")
             
             # Test agent imports
@@ -168,77 +375,67 @@ Generated for VWO GenAI Internship Assignment Testing
             self.log_test("Agent imports", True, f"Doctor: {doctor.role}, Verifier: {verifier.role}")
             
             # Test task imports  
-            from task import TASK_SEQUENCE, validate_task_dependencies
-            validate_task_dependencies()
+            TASK_SEQUENCE = _validated_task_sequence()
             self.log_test("Task workflow", True, f"{len(TASK_SEQUENCE)} tasks with validated dependencies")
             
             # Test tool imports
             from tools import read_blood_test_report, search_tool
             self.log_test("Tool integration", True, "File reader and search tools available")
             
-            duration = time.time() - start_time
+            duration = elapsed_seconds(start_ns)
             self.log_test("System validation", True, "All imports and validations successful", duration)
             return True
             
         except Exception as e:
-            duration = time.time() - start_time
+            duration = elapsed_seconds(start_ns)
             self.log_test("System validation", False, f"Error: {e}", duration)
             return False
     
     def test_file_reading_capability(self):
         """Test file reading capability with test blood report"""
-        print("\n🔍 Testing File Reading Capability...")
+        self._print("\n🔍 Testing File Reading Capability...")
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
             from tools import read_blood_test_report
             
             # Test reading the comprehensive test file
-            result = read_blood_test_report(self.test_file_path)
+            result = read_blood_test_report.run(path=str(self.test_file_path))
             
             if result and not result.startswith("Error"):
-                # Check if key medical data is present
-                key_data_present = all(keyword in result for keyword in [
-                    'COMPLETE BLOOD COUNT',
-                    'METABOLIC PANEL', 
-                    'LIPID PANEL',
-                    'LIVER FUNCTION',
-                    'Hemoglobin',
-                    'Cholesterol',
-                    'Glucose'
-                ])
-                
-                if key_data_present:
-                    duration = time.time() - start_time
-                    self.log_test("File reading", True, f"Successfully read {len(result)} chars with all key data", duration)
+                # Snapshot check: everything but whitespace must survive the read unchanged
+                if normalized_digest(result) == EXPECTED_REPORT_DIGEST:
+                    duration = elapsed_seconds(start_ns)
+                    self.log_test("File reading", True, f"Successfully read {len(result)} chars matching the fixture", duration)
                     return True
                 else:
-                    duration = time.time() - start_time
-                    self.log_test("File reading", False, "Missing key medical data in parsed content", duration)
+                    # Name the key data the reader lost, telling a reader bug apart from a changed source file
+                    lost = lost_key_data(result, self.test_file_path)
+                    detail = f"missing {', '.join(lost)}" if lost else "content differs from the fixture"
+                    duration = elapsed_seconds(start_ns)
+                    self.log_test("File reading", False, f"Parsed content does not match the fixture: {detail}", duration)
                     return False
             else:
-                duration = time.time() - start_time
+                duration = elapsed_seconds(start_ns)
                 self.log_test("File reading", False, f"Tool returned error: {result[:100] if result else 'No result'}", duration)
                 return False
                 
         except Exception as e:
-            duration = time.time() - start_time
+            duration = elapsed_seconds(start_ns)
             self.log_test("File reading", False, f"Error: {e}", duration)
             return False
     
     def test_full_analysis_workflow(self):
         """Test complete analysis workflow with real AI processing"""
-        print("\n🔍 Testing Full Analysis Workflow...")
-        print("    ⚠️  This test requires OpenAI API and may take 2-3 minutes")
+        self._print("\n🔍 Testing Full Analysis Workflow...")
+        self._print("    ⚠️  This test requires OpenAI API and may take 2-3 minutes")
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
-            from main import BloodTestAnalyzer
-            
-            # Initialize analyzer (this validates environment)
-            analyzer = BloodTestAnalyzer()
+            # Shared analyzer (this validates environment on first use)
+            analyzer = _analyzer()
             
             # Test query creation and validation
             test_query = "Please provide a comprehensive analysis of my blood test results, focusing on cardiovascular health, metabolic function, and any areas that need attention. Include nutrition and exercise recommendations."
@@ -259,139 +456,206 @@ Generated for VWO GenAI Internship Assignment Testing
                 return False
             
             # Run actual analysis (this is the big test)
-            print("    🤖 Executing multi-agent AI analysis workflow...")
-            print("    📋 Tasks: Verification → Medical → Nutrition → Exercise → Summary")
+            self._print("    🤖 Executing multi-agent AI analysis workflow...")
+            self._print("    📋 Tasks: Verification → Medical → Nutrition → Exercise → Summary")
+            self.flush_output()  # Show progress before the multi-minute API calls
             
-            analysis_start = time.time()
+            analysis_start_ns = time.perf_counter_ns()
             try:
-                analysis_result = analyzer.run_analysis(validated_file, validated_query)
-                analysis_duration = time.time() - analysis_start
+                with openai_cassette('integration_full.yaml'):
+                    analysis_result = analyzer.run_analysis(validated_file, validated_query)
+                analysis_duration = elapsed_seconds(analysis_start_ns)
                 
                 if analysis_result and len(analysis_result) > 500:
                     # Check for key components in analysis
-                    analysis_components = [
-                        'VERIFICATION' or 'DOCUMENT',
-                        'MEDICAL' or 'BLOOD',
-                        'NUTRITION' or 'DIETARY',
-                        'EXERCISE' or 'PHYSICAL',
-                        'SUMMARY' or 'RECOMMENDATION'
-                    ]
-                    
-                    components_found = sum(1 for component in analysis_components 
-                                         if any(keyword in analysis_result.upper() 
-                                               for keyword in component.split(' or ')))
+                    components_found = len({match.lastgroup for match in COMPONENTS_RE.finditer(analysis_result)})
                     
                     if components_found >= 3:
                         self.log_test("Multi-agent analysis", True, 
-                                    f"Generated {len(analysis_result)} chars, {components_found}/5 components", 
+                                    f"Generated {len(analysis_result)} chars, {components_found}/{len(COMPONENTS)} components", 
                                     analysis_duration)
                         
-                        total_duration = time.time() - start_time
+                        total_duration = elapsed_seconds(start_ns)
                         self.log_test("Complete workflow", True, "Full end-to-end analysis successful", total_duration)
                         return True
                     else:
                         self.log_test("Multi-agent analysis", False, 
-                                    f"Incomplete analysis: only {components_found}/5 components found", 
+                                    f"Incomplete analysis: only {components_found}/{len(COMPONENTS)} components found", 
                                     analysis_duration)
                         return False
                 else:
-                    analysis_duration = time.time() - analysis_start
+                    analysis_duration = elapsed_seconds(analysis_start_ns)
                     self.log_test("Multi-agent analysis", False, 
                                 f"Analysis too short or empty: {len(analysis_result) if analysis_result else 0} chars", 
                                 analysis_duration)
                     return False
                     
             except Exception as e:
-                analysis_duration = time.time() - analysis_start
+                analysis_duration = elapsed_seconds(analysis_start_ns)
                 self.log_test("Multi-agent analysis", False, f"Analysis failed: {e}", analysis_duration)
                 return False
                 
         except Exception as e:
-            total_duration = time.time() - start_time
+            total_duration = elapsed_seconds(start_ns)
             self.log_test("Workflow setup", False, f"Setup failed: {e}", total_duration)
             return False
     
     def run_integration_tests(self):
         """Run complete integration test suite"""
-        print("🧪 VWO GenAI Internship Assignment - Integration Testing")
-        print("=" * 70)
-        print("🔬 End-to-end testing of complete blood test analysis workflow")
-        print("📋 Validating all components working together")
-        print("=" * 70)
+        self._print("🧪 VWO GenAI Internship Assignment - Integration Testing")
+        self._print("=" * 70)
+        self._print("🔬 End-to-end testing of complete blood test analysis workflow")
+        self._print("📋 Validating all components working together")
+        self._print("=" * 70)
         
         # Run tests in order
         tests = [
             ("Environment Readiness", self.test_environment_readiness),
             ("System Validation", self.test_system_imports_and_validation),
             ("File Reading", self.test_file_reading_capability),
-            ("Full Analysis Workflow", self.test_full_analysis_workflow),
         ]
+        if SKIP_OPENAI:
+            self._print("⏭️  SKIP_OPENAI set - skipping the full analysis workflow")
+        else:
+            tests.append(("Full Analysis Workflow", self.test_full_analysis_workflow))
         
         for test_name, test_function in tests:
             try:
-                print(f"\n{'='*20} {test_name} {'='*20}")
+                self._print(f"\n{'='*20} {test_name} {'='*20}")
                 result = test_function()
                 if not result:
-                    print(f"⚠️  {test_name} failed - stopping integration tests")
+                    self._print(f"⚠️  {test_name} failed - stopping integration tests")
                     break
             except Exception as e:
-                print(f"❌ {test_name} failed with exception: {e}")
+                self._print(f"❌ {test_name} failed with exception: {e}")
                 self.log_test(f"{test_name} (category)", False, f"Exception: {e}")
                 break
+            finally:
+                self.flush_output()
         
         # Print final summary
         self.print_integration_summary()
         
-        return all(result['success'] for result in self.test_results)
+        return all(result.success for result in self.test_results)
     
     def print_integration_summary(self):
         """Print comprehensive integration test summary"""
         total_tests = len(self.test_results)
-        passed_tests = sum(1 for result in self.test_results if result['success'])
+        passed_tests = sum(result.success for result in self.test_results)
         failed_tests = total_tests - passed_tests
-        total_duration = sum(result.get('duration', 0) for result in self.test_results)
+        total_duration = math.fsum(result.duration for result in self.test_results)
         
-        print("\n" + "=" * 70)
-        print("📊 INTEGRATION TESTING RESULTS")
-        print("=" * 70)
+        self._print("\n" + "=" * 70)
+        self._print("📊 INTEGRATION TESTING RESULTS")
+        self._print("=" * 70)
         
-        print(f"✅ Passed: {passed_tests}")
-        print(f"❌ Failed: {failed_tests}")
-        print(f"📈 Success Rate: {(passed_tests/total_tests*100):.1f}%")
-        print(f"⏱️  Total Duration: {total_duration:.1f} seconds")
+        self._print(f"✅ Passed: {passed_tests}")
+        self._print(f"❌ Failed: {failed_tests}")
+        self._print(f"📈 Success Rate: {(passed_tests/total_tests*100):.1f}%")
+        self._print(f"⏱️  Total Duration: {total_duration:.1f} seconds")
         
         if failed_tests == 0:
-            print(f"\n🎉 ALL INTEGRATION TESTS PASSED!")
-            print(f"🚀 Your complete system is working end-to-end!")
-            print(f"✅ SYSTEM CAPABILITIES VERIFIED:")
-            print(f"   • Multi-agent AI workflow execution")
-            print(f"   • Comprehensive blood test analysis") 
-            print(f"   • Professional error handling")
-            print(f"   • Medical safety protocols")
-            print(f"   • File processing and validation")
+            self._print(f"\n🎉 ALL INTEGRATION TESTS PASSED!")
+            self._print(f"🚀 Your complete system is working end-to-end!")
+            self._print(f"✅ SYSTEM CAPABILITIES VERIFIED:")
+            self._print(f"   • Multi-agent AI workflow execution")
+            self._print(f"   • Comprehensive blood test analysis") 
+            self._print(f"   • Professional error handling")
+            self._print(f"   • Medical safety protocols")
+            self._print(f"   • File processing and validation")
             
-            print(f"\n🎯 READY FOR VWO SUBMISSION:")
-            print(f"   • All 16 bug fixes are working correctly")
-            print(f"   • System demonstrates CrewAI expertise")
-            print(f"   • Production-ready quality validated")
-            print(f"   • Complete end-to-end functionality confirmed")
+            self._print(f"\n🎯 READY FOR VWO SUBMISSION:")
+            self._print(f"   • All 16 bug fixes are working correctly")
+            self._print(f"   • System demonstrates CrewAI expertise")
+            self._print(f"   • Production-ready quality validated")
+            self._print(f"   • Complete end-to-end functionality confirmed")
             
         elif failed_tests <= 2:
-            print(f"\n⚠️  MINOR ISSUES DETECTED")
-            print(f"🔧 Core functionality working, minor fixes needed")
+            self._print(f"\n⚠️  MINOR ISSUES DETECTED")
+            self._print(f"🔧 Core functionality working, minor fixes needed")
             
         else:
-            print(f"\n🚨 MAJOR ISSUES DETECTED")
-            print(f"🔧 Please address failing tests before submission")
+            self._print(f"\n🚨 MAJOR ISSUES DETECTED")
+            self._print(f"🔧 Please address failing tests before submission")
         
         if failed_tests > 0:
-            print(f"\n❌ ISSUES TO ADDRESS:")
+            self._print(f"\n❌ ISSUES TO ADDRESS:")
             for result in self.test_results:
-                if not result['success']:
-                    print(f"   • {result['test']}: {result['details']}")
+                if not result.success:
+                    self._print(f"   • {result.test}: {result.details}")
+        
+        self.flush_output()
+
+# pytest entry points - each phase is an independent test so `pytest -n auto` can run
+# the OpenAI-bound workflow alongside the import and file checks (see conftest.py)
+slow = pytest.mark.slow if PYTEST_AVAILABLE else (lambda func: func)
+
+def _assert_phase(phase):
+    """Run one IntegrationTester phase and fail with the details it logged"""
+    tester = phase.__self__
+    recorded = len(tester.test_results)
+    try:
+        passed = phase()
+    finally:
+        tester.flush_output()
+    failures = [f"{result.test}: {result.details}" for result in tester.test_results[recorded:] if not result.success]
+    assert passed, "; ".join(failures) or f"{phase.__name__} failed"
+
+def test_environment_readiness(integration_tester):
+    _assert_phase(integration_tester.test_environment_readiness)
 
-def main():
+def test_system_imports_and_validation(integration_tester):
+    _assert_phase(integration_tester.test_system_imports_and_validation)
+
+def test_file_reading_capability(integration_tester):
+    _assert_phase(integration_tester.test_file_reading_capability)
+
+def test_file_reading_names_lost_key_data(integration_tester):
+    """The mismatch diagnostic must name key data the reader dropped, and nothing else"""
+    source = integration_tester.test_file_path
+    report = Path(source).read_text()
+    assert lost_key_data(report, source) == []
+    assert lost_key_data(report.replace("Glucose", "").replace("LIPID PANEL", ""), source) == ["Glucose", "LIPID PANEL"]
+
+def test_scan_stream_finds_keywords_across_chunks(integration_tester, monkeypatch):
+    """Small chunks force keywords to straddle read boundaries; the overlap must still catch them"""
+    source = integration_tester.test_file_path
+    expected = set(KEY_MEDICAL_DATA_BYTES_RE.findall(Path(source).read_bytes()))
+    monkeypatch.setattr(sys.modules[__name__], "SCAN_CHUNK_SIZE", 7)
+    assert scan_stream(source, KEY_MEDICAL_DATA_BYTES_RE, max(map(len, KEY_MEDICAL_DATA))) == expected
+    assert len(expected) == len(KEY_MEDICAL_DATA)
+
+def test_streamed_summary_is_printed_once(integration_tester, capsys):
+    """A summary already streamed to the terminal must not be repeated by display_results"""
+    analyzer = _analyzer()
+    streamer = sys.modules['main'].SUMMARY_STREAMER
+    summary = "Integrated summary: cholesterol 185 mg/dL is within range."
+    streamer.reset()
+    streamer.active = True
+    try:
+        for chunk in ("Thought: done\nFinal Answer: ", summary[:20], summary[20:]):
+            streamer._on_chunk(None, type("Chunk", (), {"chunk": chunk})())
+    finally:
+        streamer.active = False
+    try:
+        analyzer.display_results(summary, integration_tester.test_file_path, "Test query", 1.0)
+    finally:
+        streamer.reset()
+    assert capsys.readouterr().out.count(summary) == 1
+
+@slow
+def test_full_analysis_workflow(integration_tester):
+    if SKIP_OPENAI:
+        pytest.skip("SKIP_OPENAI set")
+    _assert_phase(integration_tester.test_full_analysis_workflow)
+
+def main(argv=None):
     """Main integration testing function"""
+    parser = argparse.ArgumentParser(description="VWO blood test analysis integration tests")
+    parser.add_argument('-y', '--yes', action='store_true',
+                        help='Run without the API-cost confirmation prompt')
+    args = parser.parse_args(argv)
+    
     try:
         print("🔧 Initializing integration testing environment...")
         tester = IntegrationTester()
@@ -399,10 +663,11 @@ def main():
         print("⚠️  Integration testing will make actual OpenAI API calls")
         print("💰 This may consume API credits (typically $0.01-0.05)")
         
-        response = input("\nContinue with integration testing? (yes/no): ").strip().lower()
-        if response not in ['yes', 'y']:
-            print("❌ Integration testing cancelled")
-            return 1
+        if not (args.yes or os.getenv('CI')):
+            response = input("\nContinue with integration testing? (yes/no): ").strip().lower()
+            if response not in ['yes', 'y']:
+                print("❌ Integration testing cancelled")
+                return 1
         
         success = tester.run_integration_tests()
         return 0 if success else 1
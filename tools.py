@@ -5,10 +5,20 @@ All compatibility issues resolved for CrewAI integration
 
 import os
 import re
+import sys
+import functools
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 load_dotenv()
 
-from crewai.tools import tool
+# Tool decorator moved from crewai_tools into crewai itself; accept either layout
+try:
+    from crewai.tools import tool
+except ImportError:
+    from crewai_tools import tool
 
 # FIXED: Single, correct import for SerperDevTool with error handling
 try:
@@ -37,19 +47,72 @@ except ImportError:
                     }]
                 }
 
-# PDF processing imports
+# Optional RE2 engine: linear-time matching for the marker scans over arbitrary report text
 try:
-    import pypdf
-    from pypdf import PdfReader
-    PDF_AVAILABLE = True
+    import re2
+    RE2_AVAILABLE = True
 except ImportError:
+    RE2_AVAILABLE = False
+
+def _compile_marker_re(pattern: str):
+    """
+    Compile a case-insensitive marker pattern with RE2 when installed, otherwise with re.
+    The patterns are fixed at import, so one outside RE2's syntax fails loudly (re2.error).
+    """
+    if RE2_AVAILABLE:
+        return re2.compile('(?i)' + pattern)
+    return re.compile(pattern, re.IGNORECASE)
+
+# PDF processing imports - resolved on first use so importing the tools never pays for them
+@functools.cache
+def _get_pdf_reader_cls():
+    """Return the PdfReader class from pypdf, or PyPDF2 as a fallback; None when neither is installed"""
     try:
-        import PyPDF2
-        from PyPDF2 import PdfReader
-        PDF_AVAILABLE = True
+        from pypdf import PdfReader
     except ImportError:
-        PDF_AVAILABLE = False
-        print("⚠️  Warning: No PDF library found. Install pypdf or PyPDF2 for PDF processing.")
+        try:
+            from PyPDF2 import PdfReader
+        except ImportError:
+            print("⚠️  Warning: No PDF library found. Install pypdf or PyPDF2 for PDF processing.")
+            return None
+    return PdfReader
+
+# Search result cache shared by every task that cites literature in one process
+SEARCH_CACHE_SIZE = 512
+_search_cache = OrderedDict()
+
+def _normalize_query(query) -> str:
+    """Normalize a search query so case/whitespace variants share one cache entry"""
+    return " ".join(str(query).lower().split())
+
+def _cached_search(key, fetch):
+    """Return cached results for key, calling fetch() and storing the result on a miss"""
+    if key in _search_cache:
+        _search_cache.move_to_end(key)
+        return _search_cache[key]
+    
+    results = fetch()
+    _search_cache[key] = results
+    if len(_search_cache) > SEARCH_CACHE_SIZE:
+        _search_cache.popitem(last=False)
+    return results
+
+if SERPER_AVAILABLE:
+    class CachedSerperDevTool(SerperDevTool):
+        """SerperDevTool that reuses results for repeated queries across tasks"""
+        
+        def _run(self, **kwargs):
+            query = kwargs.get("search_query") or kwargs.get("query") or ""
+            options = tuple(sorted(
+                (name, str(value)) for name, value in kwargs.items()
+                if name not in ("search_query", "query")
+            ))
+            key = (_normalize_query(query), options)
+            return _cached_search(key, lambda: super(CachedSerperDevTool, self)._run(**kwargs))
+    
+    SearchTool = CachedSerperDevTool
+else:
+    SearchTool = SerperDevTool
 
 # FIXED: Creating search tool with proper error handling
 def create_search_tool():
@@ -57,16 +120,102 @@ def create_search_tool():
     try:
         api_key = os.getenv('SERPER_API_KEY')
         if api_key and SERPER_AVAILABLE:
-            return SerperDevTool(api_key=api_key)
+            return SearchTool(api_key=api_key)
         else:
             if not api_key:
                 print("⚠️  SERPER_API_KEY not found in environment variables")
-            return SerperDevTool()  # Will use mock if not available
+            return SearchTool()  # Will use mock if not available
     except Exception as e:
         print(f"⚠️  Error creating search tool: {e}")
-        return SerperDevTool()  # Fallback to mock
+        return SearchTool()  # Fallback to mock
+
+# Built on first access (PEP 562), so importing the tools never constructs a search client
+_search_tool = None
+_search_tool_lock = threading.Lock()
+
+def __getattr__(name):
+    global _search_tool
+    if name == 'search_tool':
+        with _search_tool_lock:
+            if _search_tool is None:
+                _search_tool = create_search_tool()
+        return _search_tool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Background reader so PDF parsing overlaps with the first LLM calls of the workflow
+# Pending reads are keyed like the report cache, so a file changed after prefetch is read again
+_report_reader = ThreadPoolExecutor(max_workers=2, thread_name_prefix="report-prefetch")
+_prefetched_reports = {}
+_prefetch_lock = threading.Lock()
+
+# 128 KiB reads: a typical text report is consumed in a single read() instead of many 8 KiB ones
+READ_BUFFER_SIZE = 131072
 
-search_tool = create_search_tool()
+def _advise_sequential(file) -> None:
+    """Hint the kernel to read ahead aggressively; a no-op where posix_fadvise is unavailable"""
+    try:
+        os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    except (AttributeError, OSError):
+        pass
+
+# Reports already read in this process. Keyed by (abspath, mtime_ns, size) so an edited or
+# replaced file is read again; least recently used entries go once the text exceeds the budget.
+REPORT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_report_cache = OrderedDict()
+_report_cache_bytes = 0
+_report_cache_lock = threading.Lock()
+
+def _report_key(path: str, st: os.stat_result) -> tuple:
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+def _read_report_cached(path: str, st: os.stat_result = None) -> str:
+    """_read_report with the per-process report cache in front of it"""
+    global _report_cache_bytes
+    if st is None:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return f"Error: File not found at path: {path}"
+        except OSError:
+            return _read_report(path)  # Let the reader produce its usual error message
+    key = _report_key(path, st)
+    
+    with _report_cache_lock:
+        if key in _report_cache:
+            _report_cache.move_to_end(key)
+            return _report_cache[key]
+    
+    report = _read_report(path, st)
+    if report.startswith("Error"):
+        return report
+    
+    with _report_cache_lock:
+        if key not in _report_cache:
+            _report_cache[key] = report
+            _report_cache_bytes += sys.getsizeof(report)
+            while _report_cache_bytes > REPORT_CACHE_MAX_BYTES and len(_report_cache) > 1:
+                _, evicted = _report_cache.popitem(last=False)
+                _report_cache_bytes -= sys.getsizeof(evicted)
+    return report
+
+def prefetch_blood_test_report(path: str) -> None:
+    """
+    Start reading a report in the background; the tool picks up the result when first called.
+    Pair with discard_prefetched_report() once the run is over so an unused read is released.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return  # The tool reports the problem when it is called
+    with _prefetch_lock:
+        _prefetched_reports[_report_key(path, st)] = _report_reader.submit(_read_report_cached, path, st)
+
+def discard_prefetched_report(path: str) -> None:
+    """Cancel or drop any prefetch of path the tool never consumed, e.g. when every task was cached"""
+    abspath = os.path.abspath(path)
+    with _prefetch_lock:
+        for key in [key for key in _prefetched_reports if key[0] == abspath]:
+            _prefetched_reports.pop(key).cancel()
 
 ## FIXED: Proper tool definition using @tool decorator on standalone functions
 @tool("Read Blood Test Report")
@@ -81,12 +230,32 @@ def read_blood_test_report(path: str = 'data/sample.pdf') -> str:
         str: Cleaned and formatted blood test report content
     """
     try:
-        # Validate file exists
-        if not os.path.exists(path):
-            return f"Error: File not found at path: {path}"
+        st = os.stat(path)
+    except OSError:
+        return _read_report_cached(path)  # Produces the usual not-found/read error
+    with _prefetch_lock:
+        prefetched = _prefetched_reports.pop(_report_key(path, st), None)
+    if prefetched is not None:
+        return prefetched.result()
+    return _read_report_cached(path, st)
+
+def _read_report(path: str, st: os.stat_result = None) -> str:
+    """
+    Read and clean a report file, returning an error string instead of raising.
+    Callers that already stat'ed the file pass the result in so it is not stat'ed again.
+    """
+    try:
+        # Validate file exists - a single stat instead of exists() plus the open's own lookup
+        if st is None:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                return f"Error: File not found at path: {path}"
         
-        # Get file extension
-        file_ext = os.path.splitext(path)[1].lower()
+        # Get file extension from the final path component, as splitext would
+        name = path[path.rfind(os.sep) + 1:]
+        dot = name.rfind('.')
+        file_ext = name[dot:].lower() if dot > 0 else ''
         supported_formats = ['.pdf', '.txt']
         
         if file_ext == '.pdf':
@@ -99,30 +268,34 @@ def read_blood_test_report(path: str = 'data/sample.pdf') -> str:
     except Exception as e:
         return f"Error reading file: {str(e)}"
 
+def _iter_pdf_pages(path: str):
+    """
+    Yield a PDF's report text page by page as it is extracted; empty pages yield nothing.
+    pypdf's extraction is pure Python and holds the GIL, so one pass over a single parse
+    beats splitting the pages across threads.
+    """
+    PdfReader = _get_pdf_reader_cls()
+    if PdfReader is None:
+        raise ImportError("PDF processing library not available")
+    with open(path, 'rb') as file:
+        for page_num, page in enumerate(PdfReader(file).pages):
+            try:
+                page_text = page.extract_text()
+                if page_text:
+                    yield f"\n--- Page {page_num + 1} ---\n{page_text}\n"
+            except Exception as e:
+                yield (f"\n--- Page {page_num + 1} (Error reading) ---\n"
+                       f"Error extracting text from page {page_num + 1}: {str(e)}\n")
+
 def _read_pdf_file(path: str) -> str:
     """Read PDF file and extract text content"""
-    if not PDF_AVAILABLE:
+    PdfReader = _get_pdf_reader_cls()
+    if PdfReader is None:
         return "Error: PDF processing library not available. Please install pypdf or PyPDF2."
     
     try:
-        full_report = ""
-        
-        with open(path, 'rb') as file:
-            pdf_reader = PdfReader(file)
-            
-            # Extract text from all pages
-            for page_num, page in enumerate(pdf_reader.pages):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        full_report += f"\n--- Page {page_num + 1} ---\n"
-                        full_report += page_text + "\n"
-                except Exception as e:
-                    full_report += f"\n--- Page {page_num + 1} (Error reading) ---\n"
-                    full_report += f"Error extracting text from page {page_num + 1}: {str(e)}\n"
-        
-        # Clean and format the extracted text
-        cleaned_report = _clean_report_text(full_report)
+        # Extract text from all pages, then clean and format it
+        cleaned_report = _clean_report_text("".join(_iter_pdf_pages(path)))
         
         if not cleaned_report.strip():
             return "Warning: No readable text found in PDF. File may be image-based or corrupted."
@@ -135,7 +308,8 @@ def _read_pdf_file(path: str) -> str:
 def _read_text_file(path: str) -> str:
     """Read plain text file content"""
     try:
-        with open(path, 'r', encoding='utf-8') as file:
+        with open(path, 'r', encoding='utf-8', buffering=READ_BUFFER_SIZE) as file:
+            _advise_sequential(file)
             content = file.read()
         
         return _clean_report_text(content)
@@ -143,7 +317,8 @@ def _read_text_file(path: str) -> str:
     except UnicodeDecodeError:
         try:
             # Try with different encoding
-            with open(path, 'r', encoding='latin-1') as file:
+            with open(path, 'r', encoding='latin-1', buffering=READ_BUFFER_SIZE) as file:
+                _advise_sequential(file)
                 content = file.read()
             return _clean_report_text(content)
         except Exception as e:
@@ -151,26 +326,32 @@ def _read_text_file(path: str) -> str:
     except Exception as e:
         return f"Error reading text file: {str(e)}"
 
+# Runs of spaces inside a line, squeezed to one
+_RE_MULTI_SP = re.compile(r' {2,}')
+
 def _clean_report_text(content: str) -> str:
-    """Clean and format blood test report text efficiently"""
+    """
+    Clean and format blood test report text in a single pass over its lines:
+    trailing whitespace is stripped, runs of spaces squeezed and runs of blank
+    lines collapsed to one.
+    """
     if not content:
         return ""
     
-    # Remove excessive whitespace and clean formatting using regex
-    # Replace multiple newlines with double newlines
-    content = re.sub(r'\n{3,}', '\n\n', content)
-    
-    # Replace multiple spaces with single spaces
-    content = re.sub(r' {2,}', ' ', content)
-    
-    # Remove trailing whitespace from lines
-    lines = [line.rstrip() for line in content.split('\n')]
-    content = '\n'.join(lines)
+    lines = []
+    blank_run = 0
+    for line in content.split('\n'):
+        line = line.rstrip()
+        if not line:
+            blank_run += 1
+            if blank_run == 1:
+                lines.append('')
+            continue
+        blank_run = 0
+        lines.append(_RE_MULTI_SP.sub(' ', line) if '  ' in line else line)
     
     # Remove empty lines at start and end
-    content = content.strip()
-    
-    return content
+    return '\n'.join(lines).strip()
 
 ## FIXED: Create compatibility object for backward compatibility
 class BloodTestReportTool:
@@ -204,71 +385,90 @@ def analyze_nutrition_from_blood(blood_report_data: str) -> str:
     except Exception as e:
         return f"Error in nutrition analysis: {str(e)}"
 
+# Common patterns for blood values; each one captures the value in a group named after its marker
+_NUTRITION_PATTERNS = {
+    'glucose': r'glucose[:\s]*(?P<glucose>\d+\.?\d*)',
+    'cholesterol': r'cholesterol[:\s]*(?P<cholesterol>\d+\.?\d*)',
+    'hdl': r'hdl[:\s]*(?P<hdl>\d+\.?\d*)',
+    'ldl': r'ldl[:\s]*(?P<ldl>\d+\.?\d*)',
+    'triglycerides': r'triglycerides?[:\s]*(?P<triglycerides>\d+\.?\d*)',
+    'vitamin_d': r'vitamin\s*d[:\s]*(?P<vitamin_d>\d+\.?\d*)',
+    'b12': r'b12[:\s]*(?P<b12>\d+\.?\d*)',
+    'iron': r'iron[:\s]*(?P<iron>\d+\.?\d*)',
+    'hemoglobin': r'hemoglobin[:\s]*(?P<hemoglobin>\d+\.?\d*)'
+}
+# All markers in one case-insensitive alternation so the report is scanned once, as written
+_FUSED_MARKER_RE = _compile_marker_re('|'.join(_NUTRITION_PATTERNS.values()))
+
 def _extract_nutrition_markers(blood_data: str) -> dict:
     """Extract nutrition-related blood markers"""
-    markers = {}
-    
-    # Common patterns for blood values
-    patterns = {
-        'glucose': r'glucose[:\s]*(\d+\.?\d*)',
-        'cholesterol': r'cholesterol[:\s]*(\d+\.?\d*)',
-        'hdl': r'hdl[:\s]*(\d+\.?\d*)',
-        'ldl': r'ldl[:\s]*(\d+\.?\d*)',
-        'triglycerides': r'triglycerides?[:\s]*(\d+\.?\d*)',
-        'vitamin_d': r'vitamin\s*d[:\s]*(\d+\.?\d*)',
-        'b12': r'b12|vitamin\s*b12[:\s]*(\d+\.?\d*)',
-        'iron': r'iron[:\s]*(\d+\.?\d*)',
-        'hemoglobin': r'hemoglobin[:\s]*(\d+\.?\d*)'
-    }
-    
-    blood_data_lower = blood_data.lower()
-    
-    for marker, pattern in patterns.items():
-        matches = re.search(pattern, blood_data_lower)
-        if matches:
-            try:
-                markers[marker] = float(matches.group(1))
-            except ValueError:
-                continue
+    found = {}
     
-    return markers
+    # The first reading of each marker wins, as with a per-marker search
+    for match in _FUSED_MARKER_RE.finditer(blood_data):
+        marker = match.lastgroup
+        if marker in found:
+            continue
+        try:
+            found[marker] = float(match.group(marker))
+        except ValueError:
+            continue
+        if len(found) == len(_NUTRITION_PATTERNS):
+            break
+    
+    # Report markers in the fixed pattern order rather than the order they appear in the text
+    return {marker: found[marker] for marker in _NUTRITION_PATTERNS if marker in found}
+
+# Static parts of the nutrition report, built once at import
+_NUTRITION_PROLOGUE = (
+    "NUTRITION ANALYSIS BASED ON BLOOD MARKERS\n"
+    + "=" * 45 + "\n\n"
+    "DETECTED MARKERS:\n"
+)
+_NUTRITION_EPILOGUE = (
+    "\nIMPORTANT: This analysis is for informational purposes only.\n"
+    "Consult with a registered dietitian for personalized nutrition planning.\n"
+)
+
+# Advice lines emitted, in this order, when any marker of the group was detected
+_MARKER_GROUPS = (
+    (frozenset({'glucose'}), (
+        "• Monitor carbohydrate intake and focus on complex carbs\n",
+        "• Consider smaller, frequent meals to stabilize blood sugar\n",
+    )),
+    (frozenset({'cholesterol', 'hdl', 'ldl'}), (
+        "• Emphasize heart-healthy fats (omega-3, olive oil)\n",
+        "• Increase fiber intake with fruits, vegetables, and whole grains\n",
+    )),
+    (frozenset({'hemoglobin', 'iron'}), (
+        "• Ensure adequate iron-rich foods (lean meats, spinach, legumes)\n",
+        "• Pair iron sources with vitamin C for better absorption\n",
+    )),
+    (frozenset({'vitamin_d'}), (
+        "• Consider vitamin D-rich foods (fatty fish, fortified dairy)\n",
+    )),
+    (frozenset({'b12'}), (
+        "• Include B12 sources (meat, fish, dairy, fortified foods)\n",
+    )),
+)
 
 def _generate_nutrition_recommendations(markers: dict) -> str:
     """Generate nutrition recommendations based on markers"""
     if not markers:
         return "NUTRITION ANALYSIS: Insufficient blood marker data for detailed analysis"
     
-    recommendations = "NUTRITION ANALYSIS BASED ON BLOOD MARKERS\n"
-    recommendations += "=" * 45 + "\n\n"
-    
-    recommendations += "DETECTED MARKERS:\n"
+    recommendations = [_NUTRITION_PROLOGUE]
     for marker, value in markers.items():
-        recommendations += f"• {marker.replace('_', ' ').title()}: {value}\n"
-    
-    recommendations += "\nGENERAL NUTRITION RECOMMENDATIONS:\n"
-    
-    if 'glucose' in markers:
-        recommendations += "• Monitor carbohydrate intake and focus on complex carbs\n"
-        recommendations += "• Consider smaller, frequent meals to stabilize blood sugar\n"
-    
-    if 'cholesterol' in markers or 'hdl' in markers or 'ldl' in markers:
-        recommendations += "• Emphasize heart-healthy fats (omega-3, olive oil)\n"
-        recommendations += "• Increase fiber intake with fruits, vegetables, and whole grains\n"
-    
-    if 'hemoglobin' in markers or 'iron' in markers:
-        recommendations += "• Ensure adequate iron-rich foods (lean meats, spinach, legumes)\n"
-        recommendations += "• Pair iron sources with vitamin C for better absorption\n"
+        recommendations.append(f"• {marker.replace('_', ' ').title()}: {value}\n")
     
-    if 'vitamin_d' in markers:
-        recommendations += "• Consider vitamin D-rich foods (fatty fish, fortified dairy)\n"
+    recommendations.append("\nGENERAL NUTRITION RECOMMENDATIONS:\n")
+    for group, advice in _MARKER_GROUPS:
+        if not group.isdisjoint(markers):
+            recommendations.extend(advice)
     
-    if 'b12' in markers:
-        recommendations += "• Include B12 sources (meat, fish, dairy, fortified foods)\n"
+    recommendations.append(_NUTRITION_EPILOGUE)
     
-    recommendations += "\nIMPORTANT: This analysis is for informational purposes only.\n"
-    recommendations += "Consult with a registered dietitian for personalized nutrition planning.\n"
-    
-    return recommendations
+    return "".join(recommendations)
 
 @tool("Create Exercise Plan from Blood Work")
 def create_exercise_plan_from_blood(blood_report_data: str) -> str:
@@ -296,73 +496,91 @@ def create_exercise_plan_from_blood(blood_report_data: str) -> str:
     except Exception as e:
         return f"Error in exercise planning: {str(e)}"
 
-def _assess_exercise_readiness(blood_data: str) -> dict:
+# Markers that shape the exercise assessment, matched case-insensitively
+_EXERCISE_MARKERS = ('glucose', 'cholesterol', 'hemoglobin', 'blood pressure')
+_EXERCISE_MARKER_RE = _compile_marker_re('|'.join(_EXERCISE_MARKERS))
+_EXERCISE_MARKER_COUNT = len(_EXERCISE_MARKERS)
+
+@dataclass(slots=True)
+class ExerciseAssessment:
+    """Exercise readiness derived from blood markers; use dataclasses.asdict() to serialize"""
+    cardiovascular_risk: str = 'unknown'
+    metabolic_health: str = 'unknown'
+    energy_levels: str = 'unknown'
+    recommendations: list = field(default_factory=list)
+
+def _assess_exercise_readiness(blood_data: str) -> ExerciseAssessment:
     """Assess exercise readiness from blood markers"""
-    assessment = {
-        'cardiovascular_risk': 'unknown',
-        'metabolic_health': 'unknown',
-        'energy_levels': 'unknown',
-        'recommendations': []
-    }
+    assessment = ExerciseAssessment()
     
-    blood_data_lower = blood_data.lower()
+    # One pass for all four keywords, stopping once each has been seen
+    found = set()
+    for match in _EXERCISE_MARKER_RE.finditer(blood_data):
+        found.add(match.group().lower())
+        if len(found) == _EXERCISE_MARKER_COUNT:
+            break
     
     # Basic assessment based on common markers
-    if 'glucose' in blood_data_lower:
-        assessment['metabolic_health'] = 'needs_monitoring'
-        assessment['recommendations'].append('Monitor blood sugar before/after exercise')
+    if 'glucose' in found:
+        assessment.metabolic_health = 'needs_monitoring'
+        assessment.recommendations.append('Monitor blood sugar before/after exercise')
     
-    if 'cholesterol' in blood_data_lower:
-        assessment['cardiovascular_risk'] = 'present'
-        assessment['recommendations'].append('Focus on cardiovascular exercises')
+    if 'cholesterol' in found:
+        assessment.cardiovascular_risk = 'present'
+        assessment.recommendations.append('Focus on cardiovascular exercises')
     
-    if 'hemoglobin' in blood_data_lower:
-        assessment['energy_levels'] = 'assess_based_on_levels'
-        assessment['recommendations'].append('Monitor energy during exercise')
+    if 'hemoglobin' in found:
+        assessment.energy_levels = 'assess_based_on_levels'
+        assessment.recommendations.append('Monitor energy during exercise')
     
-    if 'blood pressure' in blood_data_lower:
-        assessment['cardiovascular_risk'] = 'monitor'
-        assessment['recommendations'].append('Avoid high-intensity exercises initially')
+    if 'blood pressure' in found:
+        assessment.cardiovascular_risk = 'monitor'
+        assessment.recommendations.append('Avoid high-intensity exercises initially')
     
     return assessment
 
-def _generate_exercise_recommendations(health_markers: dict) -> str:
+# Static parts of the exercise plan, built once at import
+_EXERCISE_PROLOGUE = (
+    "EXERCISE RECOMMENDATIONS BASED ON BLOOD WORK\n"
+    + "=" * 42 + "\n\n"
+    "GENERAL EXERCISE GUIDELINES:\n"
+    "• Start slowly and progress gradually\n"
+    "• Monitor how you feel during exercise\n"
+    "• Stay hydrated and maintain proper nutrition\n"
+    "• Warm up before and cool down after exercise\n"
+    "• Stop if you experience chest pain, dizziness, or shortness of breath\n\n"
+    "RECOMMENDED ACTIVITIES:\n"
+    "• Walking: Start with 10-15 minutes daily, increase gradually\n"
+    "• Swimming: Low-impact, full-body exercise\n"
+    "• Cycling: Good cardiovascular workout\n"
+    "• Strength training: 2-3 times per week with light weights\n"
+    "• Yoga/Stretching: Improve flexibility and reduce stress\n\n"
+)
+_EXERCISE_EPILOGUE = (
+    "MONITORING GUIDELINES:\n"
+    "• Track your heart rate during exercise\n"
+    "• Keep a log of how you feel before/after workouts\n"
+    "• Progress gradually - increase intensity/duration by 10% weekly\n"
+    "• Schedule rest days for recovery\n\n"
+    "IMPORTANT DISCLAIMER:\n"
+    "This is general guidance based on available data.\n"
+    "Consult with a certified exercise physiologist or your healthcare provider\n"
+    "before starting any new exercise program, especially if you have health conditions.\n"
+)
+
+def _generate_exercise_recommendations(health_markers: ExerciseAssessment) -> str:
     """Generate exercise plan based on health assessment"""
-    plan = "EXERCISE RECOMMENDATIONS BASED ON BLOOD WORK\n"
-    plan += "=" * 42 + "\n\n"
-    
-    plan += "GENERAL EXERCISE GUIDELINES:\n"
-    plan += "• Start slowly and progress gradually\n"
-    plan += "• Monitor how you feel during exercise\n"
-    plan += "• Stay hydrated and maintain proper nutrition\n"
-    plan += "• Warm up before and cool down after exercise\n"
-    plan += "• Stop if you experience chest pain, dizziness, or shortness of breath\n\n"
-    
-    plan += "RECOMMENDED ACTIVITIES:\n"
-    plan += "• Walking: Start with 10-15 minutes daily, increase gradually\n"
-    plan += "• Swimming: Low-impact, full-body exercise\n"
-    plan += "• Cycling: Good cardiovascular workout\n"
-    plan += "• Strength training: 2-3 times per week with light weights\n"
-    plan += "• Yoga/Stretching: Improve flexibility and reduce stress\n\n"
-    
-    if health_markers.get('recommendations'):
-        plan += "SPECIFIC CONSIDERATIONS BASED ON YOUR BLOOD WORK:\n"
-        for rec in health_markers['recommendations']:
-            plan += f"• {rec}\n"
-        plan += "\n"
-    
-    plan += "MONITORING GUIDELINES:\n"
-    plan += "• Track your heart rate during exercise\n"
-    plan += "• Keep a log of how you feel before/after workouts\n"
-    plan += "• Progress gradually - increase intensity/duration by 10% weekly\n"
-    plan += "• Schedule rest days for recovery\n\n"
-    
-    plan += "IMPORTANT DISCLAIMER:\n"
-    plan += "This is general guidance based on available data.\n"
-    plan += "Consult with a certified exercise physiologist or your healthcare provider\n"
-    plan += "before starting any new exercise program, especially if you have health conditions.\n"
-    
-    return plan
+    plan = [_EXERCISE_PROLOGUE]
+    
+    if health_markers.recommendations:
+        plan.append("SPECIFIC CONSIDERATIONS BASED ON YOUR BLOOD WORK:\n")
+        for rec in health_markers.recommendations:
+            plan.append(f"• {rec}\n")
+        plan.append("\n")
+    
+    plan.append(_EXERCISE_EPILOGUE)
+    
+    return "".join(plan)
 
 # Validation function for external use
 def validate_blood_test_file(file_path: str) -> bool:
@@ -404,8 +622,11 @@ def validate_blood_test_file(file_path: str) -> bool:
 __all__ = [
     'search_tool', 
     'read_blood_test_report', 
+    'prefetch_blood_test_report',
+    'discard_prefetched_report',
     'BloodTestReportTool', 
     'analyze_nutrition_from_blood', 
     'create_exercise_plan_from_blood',
+    'ExerciseAssessment',
     'validate_blood_test_file'
 ]
\ No newline at end of file